@@ -0,0 +1,154 @@
+"""Computerized adaptive delivery based on the Rasch (one-parameter) model.
+
+Offline, :func:`fit_difficulties` estimates each question's difficulty from
+stored submissions (``manage.py calibrate_items``). At runtime an
+:class:`ItemIndex` holds a quiz's questions sorted by difficulty, so picking
+the next question is a bisect around the current ability estimate and a
+short outward scan, with no database access per step.
+"""
+import math
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+
+from django.conf import settings
+
+from .cache import get_cache
+from .models import Question
+from .readmodel import get_published_view
+
+CALIBRATION_KEY = "mcquiz:calibration"
+LIMIT = 4.0
+THETA_GRID = [step / 10 for step in range(-40, 41)]
+PRIOR = [math.exp(-theta * theta / 2) for theta in THETA_GRID]
+
+
+def probability(theta, difficulty):
+    """Chance that a student of ability ``theta`` answers correctly."""
+    return 1 / (1 + math.exp(difficulty - theta))
+
+
+def estimate_ability(responses):
+    """Expected a posteriori ability from ``(difficulty, correct)`` pairs.
+
+    Uses a standard normal prior on a fixed grid, so the estimate stays
+    finite when every answer so far is right (or wrong).
+    """
+    weights = list(PRIOR)
+    for difficulty, correct in responses:
+        for i, theta in enumerate(THETA_GRID):
+            p = probability(theta, difficulty)
+            weights[i] *= p if correct else 1 - p
+    total = sum(weights)
+    return sum(w * theta for w, theta in zip(weights, THETA_GRID)) / total
+
+
+def get_adaptive_length():
+    """Number of questions in an adaptive attempt (``MCQUIZ_ADAPTIVE_LENGTH``)."""
+    return getattr(settings, "MCQUIZ_ADAPTIVE_LENGTH", 10)
+
+
+class ItemIndex:
+    """A quiz's questions sorted by difficulty for next-item selection."""
+
+    __slots__ = ("difficulties", "question_ids", "questions", "by_id")
+
+    def __init__(self, quiz, difficulties):
+        items = sorted(
+            (difficulties.get(question.id) or 0.0, question.id)
+            for question in quiz.questions
+        )
+        self.difficulties = array("d", (difficulty for difficulty, _ in items))
+        self.question_ids = array("q", (pk for _, pk in items))
+        self.questions = {question.id: question for question in quiz.questions}
+        self.by_id = {pk: difficulty for difficulty, pk in items}
+
+    def difficulty(self, pk):
+        return self.by_id[pk]
+
+    def next_item(self, theta, administered):
+        """Id of the unused question whose difficulty is closest to ``theta``."""
+        difficulties = self.difficulties
+        right = bisect_left(difficulties, theta)
+        left = right - 1
+        while left >= 0 or right < len(difficulties):
+            if right >= len(difficulties) or (
+                    left >= 0 and theta - difficulties[left] <= difficulties[right] - theta):
+                candidate = self.question_ids[left]
+                left -= 1
+            else:
+                candidate = self.question_ids[right]
+                right += 1
+            if candidate not in administered:
+                return candidate
+        return None
+
+
+def build_item_index(quiz):
+    difficulties = dict(
+        Question.objects.filter(quiz=quiz.id, hasAnswer=True)
+        .values_list("pk", "difficulty")
+    )
+    return ItemIndex(quiz, difficulties)
+
+
+@lru_cache(maxsize=getattr(settings, "MCQUIZ_QUIZ_CACHE_SIZE", 256))
+def get_published_index(pk, version, calibration):
+    return build_item_index(get_published_view(pk, version))
+
+
+def get_item_index(quiz):
+    """Return the :class:`ItemIndex` for a :class:`~MCQuizApp.readmodel.QuizView`.
+
+    Indexes of published quizzes are cached per process and rebuilt after
+    ``calibrate_items`` runs.
+    """
+    if quiz.version is None:
+        return build_item_index(quiz)
+    return get_published_index(quiz.id, quiz.version, get_cache().get(CALIBRATION_KEY, 0))
+
+
+def fit_difficulties(offsets, items, responses, n_items, iterations=10):
+    """Joint maximum likelihood fit of Rasch item difficulties.
+
+    Responses are stored column-wise: person ``p`` answered the items
+    ``items[offsets[p]:offsets[p + 1]]`` with 0/1 results in the matching
+    slice of ``responses``. Returns ``(difficulties, counts)`` arrays indexed
+    by item, with difficulties centred on zero.
+    """
+    counts = array("l", [0]) * n_items
+    right = array("d", [0.0]) * n_items
+    for item, correct in zip(items, responses):
+        counts[item] += 1
+        right[item] += correct
+    difficulties = array("d", (
+        math.log((counts[i] - right[i] + 0.5) / (right[i] + 0.5)) for i in range(n_items)))
+    abilities = array("d", [0.0]) * (len(offsets) - 1)
+
+    for _ in range(iterations):
+        gradient = array("d", [0.0]) * n_items
+        information = array("d", [0.0]) * n_items
+        for person in range(len(abilities)):
+            start, end = offsets[person], offsets[person + 1]
+            theta = abilities[person]
+            expected = info = 0.0
+            for k in range(start, end):
+                p = probability(theta, difficulties[items[k]])
+                expected += p
+                info += p * (1 - p)
+            if info:
+                observed = sum(responses[start:end])
+                theta = max(-LIMIT, min(LIMIT, theta + (observed - expected) / info))
+                abilities[person] = theta
+            for k in range(start, end):
+                p = probability(theta, difficulties[items[k]])
+                gradient[items[k]] += p - responses[k]
+                information[items[k]] += p * (1 - p)
+        for i in range(n_items):
+            if information[i]:
+                difficulties[i] = max(
+                    -LIMIT, min(LIMIT, difficulties[i] + gradient[i] / information[i]))
+        mean = sum(difficulties) / n_items if n_items else 0.0
+        for i in range(n_items):
+            difficulties[i] -= mean
+    return difficulties, counts
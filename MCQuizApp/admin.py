@@ -1,6 +1,67 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 
-from .models import Quiz, Question, Answer
+from . import search
+from .dedup import merge_questions
+from .models import Quiz, Question, Answer, SearchEntry
+from .snapshots import publish_quiz
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that avoids ``COUNT(*)`` on large unfiltered tables.
+
+    On PostgreSQL the planner's row estimate from ``pg_class`` is used when
+    the changelist is not filtered. Other backends, and filtered querysets,
+    fall back to an exact count.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == "postgresql" and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples FROM pg_class WHERE relname = %s",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] > 0:
+                return int(row[0])
+        return super().count
+
+
+class ScalableAdmin(admin.ModelAdmin):
+    """Changelist defaults shared by the MCQuiz model admins."""
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+
+class FullTextSearchMixin:
+    """Answer the changelist and autocomplete search box from the search index.
+
+    ``search_kind`` names the :class:`~MCQuizApp.models.SearchEntry` kind
+    searched and ``search_field`` the field holding the id of the indexed
+    object. ``search_fields`` must still be set for Django to show the
+    search box.
+    """
+
+    search_kind = None
+    search_field = "pk"
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return search.filter_queryset(
+            queryset, self.search_kind, search_term, self.search_field), False
 
 
 class ChoiceInline(admin.StackedInline):
@@ -9,11 +70,128 @@ class ChoiceInline(admin.StackedInline):
     max_num = 4
 
 
-class QuestionAdmin(admin.ModelAdmin):
+class QuestionActionForm(helpers.ActionForm):
+    """Action form carrying the target quiz for ``attach_to_quiz``."""
+
+    quiz = forms.ModelChoiceField(
+        queryset=Quiz.objects.all(),
+        required=False,
+        widget=AutocompleteSelect(Question._meta.get_field("quiz"), admin.site),
+    )
+
+
+class QuizAdmin(FullTextSearchMixin, ScalableAdmin):
+    list_display = (
+        "title", "number_of_questions", "pass_mark", "draft", "published_version",
+        "opens_at")
+    list_filter = ("draft",)
+    search_fields = ("title",)
+    search_kind = SearchEntry.QUIZ
+    ordering = ("title",)
+    actions = [
+        "publish_snapshot", "mark_live", "unpublish", "refresh_question_counts"]
+
+    @admin.action(description="Mark selected quizzes as live (no new snapshot)")
+    def mark_live(self, request, queryset):
+        published = queryset.mark_live()
+        self.message_user(
+            request, "{} quiz(zes) marked as live.".format(published), messages.SUCCESS)
+
+    @admin.action(description="Unpublish selected quizzes")
+    def unpublish(self, request, queryset):
+        updated = queryset.update(draft=True)
+        self.message_user(
+            request, "{} quiz(zes) moved to draft.".format(updated), messages.SUCCESS)
+
+    @admin.action(description="Recalculate number of questions")
+    def refresh_question_counts(self, request, queryset):
+        updated = queryset.refresh_question_counts()
+        self.message_user(
+            request, "{} quiz(zes) recalculated.".format(updated), messages.SUCCESS)
+
+    @admin.action(description="Publish selected quizzes (compile a new snapshot)")
+    def publish_snapshot(self, request, queryset):
+        queryset.refresh_question_counts()
+        published, skipped = [], []
+        for quiz in queryset.order_by("pk"):
+            if not quiz.number_of_questions:
+                skipped.append(str(quiz))
+                continue
+            snapshot = publish_quiz(quiz)
+            published.append(quiz.pk)
+            self.message_user(
+                request, "Published {}.".format(snapshot), messages.SUCCESS)
+        Quiz.objects.filter(pk__in=published).update(draft=False)
+        if skipped:
+            self.message_user(
+                request,
+                "Skipped {}: no answered questions.".format(", ".join(skipped)),
+                messages.WARNING,
+            )
+
+
+class QuestionAdmin(FullTextSearchMixin, ScalableAdmin):
     inlines = [ChoiceInline]
     list_display = ('content', 'hasAnswer')
+    list_filter = ('hasAnswer',)
+    search_fields = ('content',)
+    search_kind = SearchEntry.QUESTION
+    autocomplete_fields = ('quiz',)
+    action_form = QuestionActionForm
+    actions = ["attach_to_quiz", "refresh_has_answer", "merge_duplicates"]
+
+    @admin.action(description="Attach selected questions to quiz")
+    def attach_to_quiz(self, request, queryset):
+        try:
+            quiz = self.action_form.base_fields["quiz"].clean(request.POST.get("quiz"))
+        except ValidationError:
+            quiz = None
+        if quiz is None:
+            self.message_user(
+                request, "Choose a quiz to attach the questions to.", messages.ERROR)
+            return
+        attached = queryset.attach_to_quiz(quiz)
+        self.message_user(
+            request,
+            "{} question(s) attached to {}.".format(attached, quiz),
+            messages.SUCCESS,
+        )
+
+    @admin.action(description="Recompute 'Has Answer'")
+    def refresh_has_answer(self, request, queryset):
+        updated = queryset.refresh_has_answer()
+        self.message_user(
+            request, "{} question(s) updated.".format(updated), messages.SUCCESS)
+
+    @admin.action(description="Merge selected questions into the oldest")
+    def merge_duplicates(self, request, queryset):
+        questions = list(queryset.order_by("pk"))
+        if len(questions) < 2:
+            self.message_user(
+                request, "Select at least two questions to merge.", messages.ERROR)
+            return
+        merge_questions(questions[0], questions[1:])
+        self.message_user(
+            request,
+            "Merged {} question(s) into {}.".format(len(questions) - 1, questions[0].pk),
+            messages.SUCCESS,
+        )
+
+
+class AnswerAdmin(FullTextSearchMixin, ScalableAdmin):
+    """Answers are searched through their question's index entry, which
+    includes the answer text, so a search lists every answer of the matching
+    questions."""
+
+    list_display = ("content", "question", "correct")
+    list_filter = ("correct",)
+    list_select_related = ("question",)
+    search_fields = ("content",)
+    search_kind = SearchEntry.QUESTION
+    search_field = "question"
+    autocomplete_fields = ("question",)
 
 
 admin.site.register(Question, QuestionAdmin)
-admin.site.register(Quiz)
-admin.site.register(Answer)
+admin.site.register(Quiz, QuizAdmin)
+admin.site.register(Answer, AnswerAdmin)
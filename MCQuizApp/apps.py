@@ -5,3 +5,6 @@ class McquizappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'MCQuizApp'
     verbose_name = "Multiple Choice"
+
+    def ready(self):
+        from . import signals  # noqa: F401
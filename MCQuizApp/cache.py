@@ -0,0 +1,68 @@
+"""Shared cache helpers with single-flight rebuilds.
+
+When a popular quiz opens, many workers miss the same key at once. Callers
+go through :func:`get_or_build`, which lets one builder run per key: the
+builder owns a lock key added to the cache, and other threads and processes
+poll until the value appears. A striped in-process lock only guards the
+check-and-claim step, so a thread waiting on one key never holds up other
+keys on its stripe.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+def get_cache_alias():
+    """Return the cache alias configured by ``MCQUIZ_CACHE``."""
+    return getattr(settings, "MCQUIZ_CACHE", "default")
+
+
+def get_cache():
+    """Return the cache used for MCQuiz data."""
+    return caches[get_cache_alias()]
+
+
+def get_timeout():
+    """Return the timeout configured by ``MCQUIZ_CACHE_TIMEOUT``."""
+    return getattr(settings, "MCQUIZ_CACHE_TIMEOUT", 60 * 60 * 24)
+
+
+def snapshot_key(pk, version):
+    return "mcquiz:snapshot:{}:{}".format(pk, version)
+
+
+def get_or_build(key, build, lock_timeout=30, poll_interval=0.05):
+    """Return the cached value for ``key``, calling ``build()`` on a miss.
+
+    Concurrent misses on the same key trigger only one call to ``build``.
+    If the process holding the lock does not publish a value within
+    ``lock_timeout`` seconds, the waiter builds the value itself.
+    """
+    cache = get_cache()
+    value = cache.get(key)
+    if value is not None:
+        return value
+    lock_key = "{}:lock".format(key)
+    with _LOCKS[hash(key) % len(_LOCKS)]:
+        value = cache.get(key)
+        if value is not None:
+            return value
+        owner = cache.add(lock_key, 1, lock_timeout)
+    deadline = time.monotonic() + lock_timeout
+    while not owner and time.monotonic() < deadline:
+        time.sleep(poll_interval)
+        value = cache.get(key)
+        if value is not None:
+            return value
+        owner = cache.add(lock_key, 1, lock_timeout)
+    try:
+        value = build()
+        cache.set(key, value, get_timeout())
+    finally:
+        if owner:
+            cache.delete(lock_key)
+    return value
@@ -0,0 +1,219 @@
+"""Near-duplicate question detection with MinHash and LSH banding.
+
+Each question is fingerprinted from its normalized content plus its sorted
+answer set. Fingerprints are split into character shingles and summarized by
+a MinHash signature; signatures are bucketed by band so that only questions
+sharing a band become candidate pairs. Candidates are confirmed by the
+estimated Jaccard similarity of their signatures, which keeps the whole run
+roughly linear in the size of the bank instead of comparing all pairs.
+"""
+import hashlib
+import random
+import re
+from array import array
+from collections import defaultdict
+from itertools import groupby
+
+from django.db import transaction
+
+from .models import Answer, Question, Quiz, Submission
+
+SHINGLE_SIZE = 5
+MASK_SEED = 20211025
+
+
+def normalize(text):
+    """Lowercase ``text`` and reduce it to single-spaced words."""
+    return " ".join(re.findall(r"\w+", text.lower()))
+
+
+def fingerprint(content, answers):
+    """Text compared between questions: content plus the sorted answer set."""
+    return " | ".join([normalize(content)] + sorted(normalize(a) for a in answers))
+
+
+def shingle_hashes(text, size=SHINGLE_SIZE):
+    """64-bit hashes of the character shingles of ``text``."""
+    if len(text) <= size:
+        shingles = {text}
+    else:
+        shingles = {text[i:i + size] for i in range(len(text) - size + 1)}
+    return [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+        for s in shingles
+    ]
+
+
+def make_masks(num_perm):
+    rng = random.Random(MASK_SEED)
+    return [rng.getrandbits(64) for _ in range(num_perm)]
+
+
+def signature(hashes, masks):
+    """MinHash signature: for each mask, the minimum of ``hash ^ mask``."""
+    return array("Q", (min(map(mask.__xor__, hashes)) for mask in masks))
+
+
+def similarity(left, right):
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(a == b for a, b in zip(left, right)) / len(left)
+
+
+def iter_fingerprints(chunk_size=2000):
+    """Yield ``(question id, fingerprint)`` for every question in id order.
+
+    Questions and answers are streamed side by side, both ordered by
+    question id, so the bank is never loaded into memory at once.
+    """
+    answers = (
+        Answer.objects.order_by("question_id", "pk")
+        .values_list("question_id", "content")
+        .iterator(chunk_size=chunk_size)
+    )
+    pending = next(answers, None)
+    questions = (
+        Question.objects.order_by("pk")
+        .values_list("pk", "content")
+        .iterator(chunk_size=chunk_size)
+    )
+    for pk, content in questions:
+        options = []
+        while pending is not None and pending[0] <= pk:
+            if pending[0] == pk:
+                options.append(pending[1])
+            pending = next(answers, None)
+        yield pk, fingerprint(content, options)
+
+
+def link_candidates(count, groups, similar):
+    """Group items ``0 .. count - 1`` into clusters of confirmed pairs.
+
+    Every pair inside each candidate group is checked with ``similar``
+    unless the two items already share a cluster, so a dissimilar member
+    cannot hide a similar pair behind it. Returns the clusters with more
+    than one member as sorted lists of item indexes.
+    """
+    parent = list(range(count))
+
+    def find(item):
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    for group in groups:
+        for i, left in enumerate(group):
+            for right in group[i + 1:]:
+                a, b = find(left), find(right)
+                if a != b and similar(left, right):
+                    parent[max(a, b)] = min(a, b)
+
+    clusters = defaultdict(list)
+    for item in range(count):
+        clusters[find(item)].append(item)
+    return [c for c in clusters.values() if len(c) > 1]
+
+
+def find_clusters(threshold=0.8, num_perm=64, bands=16):
+    """Return clusters of near-duplicate question ids, oldest id first.
+
+    ``num_perm`` must be a multiple of ``bands``. More bands find pairs with
+    lower similarity at the cost of more candidates to check.
+
+    Signatures are kept in flat arrays, truncated to 32 bits per value for
+    the similarity check and reduced to one hash per band for bucketing, so
+    a question costs ``4 * num_perm + 8 * bands`` bytes. Buckets are then
+    built one band at a time by sorting on that band's hash.
+    """
+    if num_perm % bands:
+        raise ValueError("num_perm must be a multiple of bands.")
+    rows = num_perm // bands
+    masks = make_masks(num_perm)
+    ids = array("q")
+    values = array("I")
+    band_keys = array("q")
+    for pk, text in iter_fingerprints():
+        sig = signature(shingle_hashes(text), masks)
+        ids.append(pk)
+        values.extend(value & 0xFFFFFFFF for value in sig)
+        band_keys.extend(
+            hash(sig[band * rows:(band + 1) * rows].tobytes()) for band in range(bands))
+
+    def similar(left, right):
+        return similarity(
+            values[left * num_perm:(left + 1) * num_perm],
+            values[right * num_perm:(right + 1) * num_perm],
+        ) >= threshold
+
+    def band_groups():
+        for band in range(bands):
+            key = lambda item: band_keys[item * bands + band]
+            for _, members in groupby(sorted(range(len(ids)), key=key), key=key):
+                members = list(members)
+                if len(members) > 1:
+                    yield members
+
+    clusters = link_candidates(len(ids), band_groups(), similar)
+    return sorted(sorted(ids[item] for item in c) for c in clusters)
+
+
+def merge_questions(canonical, duplicates):
+    """Fold ``duplicates`` into the ``canonical`` question and delete them.
+
+    Quiz memberships are moved to the canonical question in bulk and stored
+    submissions are rewritten to point at it, with each answer mapped to the
+    canonical answer of the same normalized text (or ``None``). Quizzes with
+    a published snapshot keep serving it until they are published again.
+    Returns the ids of the quizzes that were affected.
+    """
+    duplicate_ids = [q.pk for q in duplicates if q.pk != canonical.pk]
+    if not duplicate_ids:
+        return []
+    through = Question.quiz.through
+    with transaction.atomic():
+        quiz_ids = sorted(set(
+            through.objects.filter(question_id__in=duplicate_ids)
+            .values_list("quiz_id", flat=True)
+        ))
+        through.objects.bulk_create(
+            [through(question_id=canonical.pk, quiz_id=quiz_id) for quiz_id in quiz_ids],
+            ignore_conflicts=True,
+        )
+        canonical_answers = {
+            normalize(content): str(pk)
+            for pk, content in canonical.answer_set.values_list("pk", "content")
+        }
+        answer_map = {
+            str(pk): canonical_answers.get(normalize(content))
+            for pk, content in Answer.objects.filter(question_id__in=duplicate_ids)
+            .values_list("pk", "content")
+        }
+        _rewrite_submissions(canonical.pk, duplicate_ids, answer_map)
+        Question.objects.filter(pk__in=duplicate_ids).delete()
+        Quiz.objects.filter(pk__in=quiz_ids).refresh_question_counts()
+    return quiz_ids
+
+
+def _rewrite_submissions(canonical_id, duplicate_ids, answer_map, batch_size=1000):
+    keys = [str(pk) for pk in duplicate_ids]
+    canonical_key = str(canonical_id)
+    submissions = (
+        Submission.objects.filter(guesses__has_any_keys=keys)
+        .only("pk", "guesses")
+        .order_by("pk")
+    )
+    batch = []
+    for submission in submissions.iterator(chunk_size=batch_size):
+        guesses = submission.guesses
+        for key in keys:
+            if key not in guesses:
+                continue
+            guess = guesses.pop(key)
+            if canonical_key not in guesses:
+                guesses[canonical_key] = answer_map.get(guess) if guess else None
+        batch.append(submission)
+        if len(batch) >= batch_size:
+            Submission.objects.bulk_update(batch, ["guesses"])
+            batch = []
+    if batch:
+        Submission.objects.bulk_update(batch, ["guesses"])
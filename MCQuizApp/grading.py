@@ -0,0 +1,72 @@
+"""Pure grading functions.
+
+Shared by the ``solutions`` view and the ``regrade`` worker processes. This
+module deliberately has no Django imports so pool workers stay light.
+"""
+
+import hashlib
+import json
+
+_keys = {}
+
+
+def count_correct(guesses, answer_key):
+    """Number of ``guesses`` that match ``answer_key``.
+
+    Both map question ids (strings) to answer ids (strings).
+    """
+    return sum(
+        1 for question, guess in guesses.items()
+        if guess is not None and answer_key.get(question) == guess
+    )
+
+
+def key_digest(answer_key):
+    """Stable hash of an answer key, used to tie checkpoints to a key."""
+    raw = json.dumps(sorted(answer_key.items()), separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def has_passed(correct, total, pass_mark):
+    """Whether ``correct`` out of ``total`` reaches ``pass_mark`` percent."""
+    return total > 0 and correct / total * 100 >= pass_mark
+
+
+def patch_key(answer_key, corrections):
+    """Return ``answer_key`` with the answers in ``corrections`` applied.
+
+    Questions missing from ``corrections`` -- for example ones removed from
+    the quiz since -- keep their original answer.
+    """
+    return {question: corrections.get(question, answer)
+            for question, answer in answer_key.items()}
+
+
+def init_worker(keys):
+    """Pool initializer: store ``{version: (answer_key, pass_mark)}`` in the
+    worker."""
+    global _keys
+    _keys = keys
+
+
+def regrade_rows(rows):
+    """Regrade ``(id, guesses, total, correct, passed, version)`` rows.
+
+    Each row is graded with the key and pass mark installed for its version
+    by :func:`init_worker`. Rows whose version has no key, or that answer
+    questions missing from it, cannot be regraded and are left alone.
+    Returns ``(id, correct, passed, old_correct, old_passed, total)`` for
+    rows whose grade changed.
+    """
+    changed = []
+    for pk, guesses, total, correct, passed, version in rows:
+        if version not in _keys:
+            continue
+        answer_key, pass_mark = _keys[version]
+        if not guesses.keys() <= answer_key.keys():
+            continue
+        new_correct = count_correct(guesses, answer_key)
+        new_passed = has_passed(new_correct, total, pass_mark)
+        if new_correct != correct or new_passed != passed:
+            changed.append((pk, new_correct, new_passed, correct, passed, total))
+    return changed
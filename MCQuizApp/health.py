@@ -0,0 +1,35 @@
+"""Liveness and readiness probes.
+
+These views only touch Django and the database connections, so a probe
+never imports the rendering stack or warms the quiz caches.
+"""
+from django.db import DatabaseError, connections
+from django.http import JsonResponse
+
+
+def healthz(request):
+    """Report that the process is serving requests.
+
+    **HTTP method:** ``GET``
+    """
+    return JsonResponse({"status": "ok"})
+
+
+def readyz(request):
+    """Report whether every configured database answers ``SELECT 1``.
+
+    Responds with status 503 and the failing aliases when a database is
+    unreachable.
+
+    **HTTP method:** ``GET``
+    """
+    failed = []
+    for alias in connections:
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except DatabaseError:
+            failed.append(alias)
+    if failed:
+        return JsonResponse({"status": "unavailable", "databases": failed}, status=503)
+    return JsonResponse({"status": "ok"})
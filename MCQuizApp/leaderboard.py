@@ -0,0 +1,76 @@
+"""Per-quiz score distributions for percentiles and top scores.
+
+Every graded submission adds one to the :class:`~MCQuizApp.models.ScoreBucket`
+for its whole-percent score. Reading the (at most 101) buckets of a quiz in
+one query is enough to answer percentile and top-N questions without
+sorting the submissions.
+"""
+from collections import Counter
+
+from django.db.models import F
+
+from .models import ScoreBucket
+
+
+def bucket_for(correct, total):
+    """Whole-percent score bucket of ``correct`` out of ``total``."""
+    return correct * 100 // total if total else 0
+
+
+def add_to_buckets(quiz_id, deltas):
+    """Apply ``{bucket: delta}`` changes to a quiz's histogram."""
+    for bucket, delta in deltas.items():
+        if not delta:
+            continue
+        buckets = ScoreBucket.objects.filter(quiz_id=quiz_id, bucket=bucket)
+        if not buckets.update(count=F("count") + delta):
+            ScoreBucket.objects.get_or_create(quiz_id=quiz_id, bucket=bucket)
+            buckets.update(count=F("count") + delta)
+
+
+def record_score(quiz_id, correct, total):
+    add_to_buckets(quiz_id, {bucket_for(correct, total): 1})
+
+
+def move_scores(quiz_id, changes):
+    """Move regraded submissions between buckets.
+
+    ``changes`` is an iterable of ``(old_correct, new_correct, total)``.
+    """
+    deltas = Counter()
+    for old, new, total in changes:
+        deltas[bucket_for(old, total)] -= 1
+        deltas[bucket_for(new, total)] += 1
+    add_to_buckets(quiz_id, deltas)
+
+
+class Distribution:
+    """Score histogram of one quiz, loaded with a single query."""
+
+    __slots__ = ("counts", "total")
+
+    def __init__(self, quiz_id):
+        self.counts = dict(
+            ScoreBucket.objects.filter(quiz_id=quiz_id, count__gt=0)
+            .values_list("bucket", "count")
+        )
+        self.total = sum(self.counts.values())
+
+    def percentile(self, correct, total):
+        """Percentile rank of ``correct`` out of ``total``: share of attempts
+        below it, counting ties as half."""
+        if not self.total:
+            return None
+        bucket = bucket_for(correct, total)
+        below = sum(count for b, count in self.counts.items() if b < bucket)
+        equal = self.counts.get(bucket, 0)
+        return (below + equal / 2) / self.total * 100
+
+    def top(self, n=5):
+        """The ``n`` highest scores, as whole percentages."""
+        scores = []
+        for bucket in sorted(self.counts, reverse=True):
+            scores.extend([bucket] * min(self.counts[bucket], n - len(scores)))
+            if len(scores) >= n:
+                break
+        return scores
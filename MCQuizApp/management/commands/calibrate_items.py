@@ -0,0 +1,65 @@
+import time
+from array import array
+
+from django.core.management.base import BaseCommand
+
+from ...adaptive import CALIBRATION_KEY, fit_difficulties
+from ...cache import get_cache
+from ...models import Answer, Question, Submission
+
+
+class Command(BaseCommand):
+    help = (
+        "Fit Rasch difficulties for questions from stored submissions and save "
+        "them for adaptive quizzes. Responses are held in flat arrays, one "
+        "entry per answered question."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=200000,
+                            help="Use at most this many of the latest submissions.")
+        parser.add_argument("--iterations", type=int, default=10)
+        parser.add_argument("--min-responses", type=int, default=20,
+                            help="Only calibrate questions with this many responses.")
+
+    def handle(self, *args, **options):
+        answer_key = {}
+        for question_id, answer_id in (
+                Answer.objects.filter(correct=True, question__hasAnswer=True)
+                .order_by("question_id", "pk").values_list("question_id", "pk")):
+            answer_key.setdefault(str(question_id), str(answer_id))
+
+        positions = {}
+        question_ids = []
+        offsets = array("q", [0])
+        items = array("l")
+        responses = array("b")
+        submissions = (
+            Submission.objects.order_by("-pk")
+            .values_list("guesses", flat=True)[:options["limit"]]
+        )
+        for guesses in submissions.iterator(chunk_size=2000):
+            for question_id, guess in guesses.items():
+                correct = answer_key.get(question_id)
+                if correct is None:
+                    continue
+                if question_id not in positions:
+                    positions[question_id] = len(question_ids)
+                    question_ids.append(int(question_id))
+                items.append(positions[question_id])
+                responses.append(int(guess == correct))
+            if len(items) > offsets[-1]:
+                offsets.append(len(items))
+
+        difficulties, counts = fit_difficulties(
+            offsets, items, responses, len(question_ids), options["iterations"])
+        calibrated = [
+            Question(pk=pk, difficulty=round(difficulties[i], 4))
+            for i, pk in enumerate(question_ids)
+            if counts[i] >= options["min_responses"]
+        ]
+        Question.objects.bulk_update(calibrated, ["difficulty"], batch_size=1000)
+        get_cache().set(CALIBRATION_KEY, time.time_ns(), None)
+        self.stdout.write(self.style.SUCCESS(
+            "Calibrated {} question(s) from {} submission(s).".format(
+                len(calibrated), len(offsets) - 1)))
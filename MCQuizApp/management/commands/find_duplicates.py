@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...dedup import find_clusters, merge_questions
+from ...models import Question
+
+
+class Command(BaseCommand):
+    help = (
+        "Report clusters of near-duplicate questions (normalized content plus "
+        "answer set) using MinHash signatures and LSH banding. With --merge, "
+        "each cluster is folded into its oldest question."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threshold", type=float, default=0.8,
+                            help="Minimum estimated Jaccard similarity (0-1).")
+        parser.add_argument("--num-perm", type=int, default=64,
+                            help="MinHash signature length.")
+        parser.add_argument("--bands", type=int, default=16,
+                            help="LSH bands; must divide --num-perm.")
+        parser.add_argument("--merge", action="store_true",
+                            help="Merge every cluster into its oldest question.")
+
+    def handle(self, *args, **options):
+        try:
+            clusters = find_clusters(
+                options["threshold"], options["num_perm"], options["bands"])
+        except ValueError as e:
+            raise CommandError(e)
+        affected = set()
+        for cluster in clusters:
+            self.stdout.write("Cluster: {}".format(", ".join(map(str, cluster))))
+            if options["merge"]:
+                questions = list(Question.objects.filter(pk__in=cluster).order_by("pk"))
+                if len(questions) > 1:
+                    affected.update(merge_questions(questions[0], questions[1:]))
+        self.stdout.write(self.style.SUCCESS(
+            "Found {} cluster(s) covering {} question(s).".format(
+                len(clusters), sum(len(c) for c in clusters))))
+        if affected:
+            self.stdout.write(
+                "Republish quizzes {} to serve the merged questions.".format(
+                    ", ".join(map(str, sorted(affected)))))
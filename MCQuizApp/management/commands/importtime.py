@@ -0,0 +1,67 @@
+import os
+import re
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_importtime(report):
+    """Parse ``python -X importtime`` output.
+
+    Returns ``(module, self_us, cumulative_us, depth)`` tuples in import
+    order; the header line is skipped.
+    """
+    rows = []
+    for line in report.splitlines():
+        match = LINE.match(line)
+        if match:
+            own, cumulative, indent, module = match.groups()
+            rows.append((module, int(own), int(cumulative), len(indent) // 2))
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure startup import time in a fresh interpreter with "
+        "'python -X importtime': set up Django, import the given modules and "
+        "report the slowest imports. With --forbid, fail if a module was "
+        "imported, to guard against heavy dependencies creeping into startup."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("modules", nargs="*", default=["MCQuizApp.urls"],
+                            help="Modules to import after django.setup().")
+        parser.add_argument("--limit", type=int, default=15,
+                            help="Number of modules to list.")
+        parser.add_argument("--forbid", action="append", default=[],
+                            help="Fail if this module (or a submodule) is imported.")
+
+    def handle(self, *args, **options):
+        code = "import django; django.setup()\n" + "".join(
+            "import {}\n".format(module) for module in options["modules"])
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE,
+                   PYTHONPATH=os.pathsep.join(sys.path))
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True, text=True, env=env)
+        if result.returncode:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+        rows = parse_importtime(result.stderr)
+        total = sum(own for _, own, _, _ in rows)
+        self.stdout.write("{:>10}  {:>10}  module".format("self ms", "total ms"))
+        for module, own, cumulative, _ in sorted(
+                rows, key=lambda row: row[2], reverse=True)[:options["limit"]]:
+            self.stdout.write("{:>10.1f}  {:>10.1f}  {}".format(
+                own / 1000, cumulative / 1000, module))
+        self.stdout.write(self.style.SUCCESS(
+            "Imported {} module(s) in {:.1f} ms.".format(len(rows), total / 1000)))
+        imported = {module for module, _, _, _ in rows}
+        found = sorted(
+            module for module in imported for forbidden in options["forbid"]
+            if module == forbidden or module.startswith(forbidden + "."))
+        if found:
+            raise CommandError("Forbidden module(s) imported: {}".format(", ".join(found)))
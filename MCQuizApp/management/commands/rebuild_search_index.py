@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ...models import Quiz, SearchEntry
+from ...search import iter_question_documents, quiz_document
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the full-text search entries for every quiz and question. "
+        "Run after installing the app on an existing database or after bulk "
+        "imports that bypass model signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        with transaction.atomic():
+            SearchEntry.objects.all().delete()
+            quizzes = Quiz.objects.order_by("pk").iterator(chunk_size=batch_size)
+            self.index(SearchEntry.QUIZ,
+                       ((quiz.pk, quiz_document(quiz)) for quiz in quizzes), batch_size)
+            self.index(SearchEntry.QUESTION,
+                       iter_question_documents(batch_size), batch_size)
+
+    def index(self, kind, documents, batch_size):
+        batch = []
+        count = 0
+        for pk, body in documents:
+            batch.append(SearchEntry(kind=kind, object_id=pk, body=body))
+            if len(batch) >= batch_size:
+                SearchEntry.objects.bulk_create(batch)
+                count += len(batch)
+                batch = []
+        SearchEntry.objects.bulk_create(batch)
+        count += len(batch)
+        self.stdout.write(self.style.SUCCESS("Indexed {} {} entries.".format(count, kind)))
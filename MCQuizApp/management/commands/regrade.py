@@ -0,0 +1,141 @@
+import multiprocessing
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.db.models import F
+
+from ...cache import get_cache
+from ...grading import init_worker, key_digest, patch_key, regrade_rows
+from ...leaderboard import move_scores
+from ...models import Quiz, QuizSnapshot, QuizStats, RegradeCheckpoint, Submission
+from ...snapshots import (
+    answer_key as live_answer_key, loads, payload_answer_key, publish_quiz)
+from ...submissions import result_key
+
+
+class Command(BaseCommand):
+    help = (
+        "Regrade every stored submission of a quiz after an answer-key "
+        "correction. Each submission is graded against the snapshot version "
+        "it was taken on, with the corrected answers from the live tables "
+        "patched in, and that version's pass mark. Submissions are streamed "
+        "in id order and each chunk is written together with its checkpoint, "
+        "so an interrupted run resumes where it stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("quiz_id", type=int)
+        parser.add_argument("--chunk-size", type=int, default=5000,
+                            help="Submissions read and written per transaction.")
+        parser.add_argument("--workers", type=int, default=1,
+                            help="Grading processes; 1 grades in this process.")
+        parser.add_argument("--publish", action="store_true",
+                            help="Publish a snapshot with the corrected key first.")
+
+    def handle(self, *args, **options):
+        try:
+            quiz = Quiz.objects.get(pk=options["quiz_id"])
+        except Quiz.DoesNotExist:
+            raise CommandError("Quiz {} does not exist.".format(options["quiz_id"]))
+        if options["publish"]:
+            publish_quiz(quiz)
+        answer_key = live_answer_key(quiz)
+        keys = self.version_keys(quiz, answer_key)
+        key_hash = key_digest(answer_key)
+        checkpoint, _ = RegradeCheckpoint.objects.get_or_create(
+            quiz=quiz, defaults={"answer_key": key_hash})
+        if checkpoint.answer_key != key_hash:
+            checkpoint.answer_key = key_hash
+            checkpoint.last_id = 0
+            checkpoint.save()
+        elif checkpoint.last_id:
+            self.stdout.write("Resuming after submission {}.".format(checkpoint.last_id))
+
+        workers = max(1, options["workers"])
+        pool = None
+        if workers > 1:
+            connections.close_all()
+            pool = multiprocessing.Pool(
+                workers, initializer=init_worker, initargs=(keys,))
+        else:
+            init_worker(keys)
+        regraded = changed = 0
+        try:
+            while True:
+                rows = list(
+                    Submission.objects.filter(quiz=quiz, id__gt=checkpoint.last_id)
+                    .order_by("id")
+                    .values_list(
+                        "id", "guesses", "total", "correct", "passed", "version",
+                        "mode", "attempt")
+                    [:options["chunk_size"]]
+                )
+                if not rows:
+                    break
+                adaptive = {row[0] for row in rows if row[6] == Submission.ADAPTIVE}
+                results = {
+                    row[0]: result_key(quiz.pk, row[5], row[1], row[7])
+                    for row in rows if row[5] is not None}
+                rows = [row[:6] for row in rows]
+                if pool is None:
+                    updates = regrade_rows(rows)
+                else:
+                    size = -(-len(rows) // workers)
+                    slices = [rows[i:i + size] for i in range(0, len(rows), size)]
+                    updates = [row for part in pool.map(regrade_rows, slices) for row in part]
+                self.write_chunk(quiz, checkpoint, rows[-1][0], updates, adaptive)
+                get_cache().delete_many(
+                    [results[row[0]] for row in updates if row[0] in results])
+                regraded += len(rows)
+                changed += len(updates)
+                self.stdout.write("Regraded {} submissions ({} changed).".format(
+                    regraded, changed))
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        checkpoint.delete()
+        self.stdout.write(self.style.SUCCESS(
+            "Finished: {} submissions regraded, {} changed.".format(regraded, changed)))
+
+    def version_keys(self, quiz, corrections):
+        """Return ``{version: (answer key, pass mark)}`` for every version
+        with submissions. ``None`` covers submissions taken before the quiz
+        was published, graded with the live key and pass mark."""
+        keys = {None: (corrections, quiz.pass_mark)}
+        versions = (
+            Submission.objects.filter(quiz=quiz, version__isnull=False)
+            .order_by().values("version").distinct()
+        )
+        snapshots = QuizSnapshot.objects.filter(
+            quiz=quiz, version__in=versions).values_list("version", "payload")
+        for version, blob in snapshots.iterator():
+            payload = loads(blob)
+            keys[version] = (
+                patch_key(payload_answer_key(payload), corrections),
+                payload["pass_mark"])
+        return keys
+
+    def write_chunk(self, quiz, checkpoint, last_id, updates, adaptive):
+        """Write regraded rows, rollup and histogram deltas and the checkpoint
+        atomically. Rows whose id is in ``adaptive`` are not part of the
+        rollups."""
+        fixed = [row for row in updates if row[0] not in adaptive]
+        delta_correct = sum(row[1] - row[3] for row in fixed)
+        delta_passes = sum(int(row[2]) - int(row[4]) for row in fixed)
+        with transaction.atomic():
+            Submission.objects.bulk_update(
+                [Submission(id=pk, correct=correct, passed=passed)
+                 for pk, correct, passed, _, _, _ in updates],
+                ["correct", "passed"],
+                batch_size=1000,
+            )
+            if delta_correct or delta_passes:
+                QuizStats.objects.get_or_create(quiz=quiz)
+                QuizStats.objects.filter(quiz=quiz).update(
+                    correct=F("correct") + delta_correct,
+                    passes=F("passes") + delta_passes,
+                )
+            move_scores(quiz.pk, [(row[3], row[1], row[5]) for row in fixed])
+            checkpoint.last_id = last_id
+            checkpoint.save(update_fields=["last_id"])
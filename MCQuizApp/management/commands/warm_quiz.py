@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from ...models import Quiz
+from ...snapshots import load_snapshot, publish_quiz
+from ...views import QuizDetailView
+
+
+class Command(BaseCommand):
+    help = (
+        "Load the shared cache for quizzes before they open: the compiled "
+        "snapshot (rendered content and answer key) and the quiz detail page "
+        "fragment."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("quiz_ids", nargs="*", type=int,
+                            help="Quizzes to warm.")
+        parser.add_argument("--within", type=int, metavar="MINUTES",
+                            help="Also warm quizzes opening within MINUTES.")
+        parser.add_argument("--publish", action="store_true",
+                            help="Publish a snapshot for quizzes that have none.")
+
+    def handle(self, *args, **options):
+        if not options["quiz_ids"] and options["within"] is None:
+            raise CommandError("Give quiz ids or --within MINUTES.")
+        quizzes = Quiz.objects.filter(pk__in=options["quiz_ids"])
+        if options["within"] is not None:
+            now = timezone.now()
+            quizzes = quizzes | Quiz.objects.filter(
+                opens_at__gte=now,
+                opens_at__lte=now + timedelta(minutes=options["within"]),
+            )
+        for quiz in quizzes.order_by("pk"):
+            if quiz.published_version is None:
+                if not options["publish"]:
+                    self.stderr.write(
+                        "Skipping {} (pk={}): no published snapshot.".format(quiz, quiz.pk))
+                    continue
+                quiz.published_version = publish_quiz(quiz).version
+            self.warm(quiz)
+            self.stdout.write(self.style.SUCCESS(
+                "Warmed {} (pk={}) v{}.".format(quiz, quiz.pk, quiz.published_version)))
+
+    def warm(self, quiz):
+        load_snapshot(quiz.pk, quiz.published_version)
+        view = QuizDetailView()
+        view.object = quiz
+        render_to_string(view.template_name, view.get_context_data(object=quiz))
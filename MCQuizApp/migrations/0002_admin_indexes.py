@@ -0,0 +1,92 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:49
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MCQuizApp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='answer',
+            name='content',
+            field=models.CharField(help_text='Text for the answer option.', max_length=1000, verbose_name='Content'),
+        ),
+        migrations.AlterField(
+            model_name='answer',
+            name='correct',
+            field=models.BooleanField(default=False, help_text='Set to True if this answer is correct.'),
+        ),
+        migrations.AlterField(
+            model_name='answer',
+            name='question',
+            field=models.ForeignKey(help_text='Question that this answer belongs to.', on_delete=django.db.models.deletion.CASCADE, to='MCQuizApp.question', verbose_name='Question'),
+        ),
+        migrations.AlterField(
+            model_name='question',
+            name='figure',
+            field=models.FileField(blank=True, default=None, help_text='Optional image displayed with the question.', null=True, upload_to='quiz_images/', verbose_name='Figure'),
+        ),
+        migrations.AlterField(
+            model_name='question',
+            name='hasAnswer',
+            field=models.BooleanField(default=False, help_text='True if a correct answer exists for this question.', verbose_name='Has Answer'),
+        ),
+        migrations.AlterField(
+            model_name='question',
+            name='quiz',
+            field=models.ManyToManyField(blank=True, help_text='Quizzes that include this question.', to='MCQuizApp.quiz', verbose_name='Quiz'),
+        ),
+        migrations.AlterField(
+            model_name='question',
+            name='reason',
+            field=models.TextField(blank=True, help_text='Explanation displayed when the question is answered.', max_length=2000, verbose_name='Explanation'),
+        ),
+        migrations.AlterField(
+            model_name='quiz',
+            name='description',
+            field=models.TextField(blank=True, help_text='Optional description of the quiz.', verbose_name='Description'),
+        ),
+        migrations.AlterField(
+            model_name='quiz',
+            name='draft',
+            field=models.BooleanField(blank=True, default=False, help_text='Designates whether this quiz is unpublished.', verbose_name='Draft'),
+        ),
+        migrations.AlterField(
+            model_name='quiz',
+            name='number_of_questions',
+            field=models.PositiveSmallIntegerField(blank=True, default=0, help_text='Calculated number of questions in the quiz.', null=True, verbose_name='# of Questions'),
+        ),
+        migrations.AlterField(
+            model_name='quiz',
+            name='pass_mark',
+            field=models.PositiveSmallIntegerField(blank=True, default=0, help_text='Required percentage score to pass (0-100).', validators=[django.core.validators.MaxValueValidator(100)], verbose_name='Pass Mark'),
+        ),
+        migrations.AlterField(
+            model_name='quiz',
+            name='title',
+            field=models.CharField(help_text='Name of the quiz displayed to users.', max_length=60, verbose_name='Title'),
+        ),
+        migrations.AlterField(
+            model_name='quiz',
+            name='url',
+            field=models.SlugField(blank=True, help_text='Auto-generated slug for building quiz URLs.', max_length=60, verbose_name='URL'),
+        ),
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(fields=['question', 'correct'], name='MCQuizApp_a_questio_551d5f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['hasAnswer'], name='MCQuizApp_q_hasAnsw_e85613_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['draft', 'number_of_questions'], name='MCQuizApp_q_draft_45283b_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MCQuizApp', '0002_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='published_version',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Snapshot version currently delivered to students.', null=True, verbose_name='Published Version'),
+        ),
+        migrations.CreateModel(
+            name='QuizSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField(help_text='Snapshot version number for the quiz.', verbose_name='Version')),
+                ('payload', models.BinaryField(help_text='Compressed JSON payload of the compiled quiz.')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Created')),
+                ('quiz', models.ForeignKey(help_text='Quiz this snapshot was compiled from.', on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='MCQuizApp.quiz', verbose_name='Quiz')),
+            ],
+            options={
+                'verbose_name': 'Quiz Snapshot',
+                'verbose_name_plural': 'Quiz Snapshots',
+                'constraints': [models.UniqueConstraint(fields=('quiz', 'version'), name='unique_quiz_snapshot_version')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MCQuizApp', '0003_quiz_snapshots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='opens_at',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='When set, the quiz is hidden until this time.', null=True, verbose_name='Opens At'),
+        ),
+    ]
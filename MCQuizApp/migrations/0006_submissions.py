@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MCQuizApp', '0005_rate_limit_bucket'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizStats',
+            fields=[
+                ('quiz', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='MCQuizApp.quiz')),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('passes', models.PositiveIntegerField(default=0)),
+                ('correct', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Quiz Statistics',
+                'verbose_name_plural': 'Quiz Statistics',
+            },
+        ),
+        migrations.CreateModel(
+            name='RegradeCheckpoint',
+            fields=[
+                ('quiz', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='MCQuizApp.quiz')),
+                ('answer_key', models.CharField(max_length=64)),
+                ('last_id', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Submission',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField(blank=True, null=True)),
+                ('attempt', models.CharField(blank=True, max_length=64)),
+                ('guesses', models.JSONField(default=dict)),
+                ('correct', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('passed', models.BooleanField(default=False)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('quiz', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='submissions', to='MCQuizApp.quiz', verbose_name='Quiz')),
+            ],
+            options={
+                'verbose_name': 'Submission',
+                'verbose_name_plural': 'Submissions',
+                'indexes': [models.Index(fields=['quiz', 'id'], name='MCQuizApp_s_quiz_id_e4a295_idx')],
+            },
+        ),
+    ]
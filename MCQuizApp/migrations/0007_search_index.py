@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:56
+
+from django.db import migrations, models
+
+SQLITE_FORWARD = [
+    'CREATE VIRTUAL TABLE "MCQuizApp_searchentry_fts" USING fts5('
+    'body, content="MCQuizApp_searchentry", content_rowid="id")',
+    'CREATE TRIGGER "MCQuizApp_searchentry_ai" AFTER INSERT ON "MCQuizApp_searchentry" BEGIN '
+    'INSERT INTO "MCQuizApp_searchentry_fts"(rowid, body) VALUES (new.id, new.body); END',
+    'CREATE TRIGGER "MCQuizApp_searchentry_ad" AFTER DELETE ON "MCQuizApp_searchentry" BEGIN '
+    'INSERT INTO "MCQuizApp_searchentry_fts"("MCQuizApp_searchentry_fts", rowid, body) '
+    "VALUES ('delete', old.id, old.body); END",
+    'CREATE TRIGGER "MCQuizApp_searchentry_au" AFTER UPDATE ON "MCQuizApp_searchentry" BEGIN '
+    'INSERT INTO "MCQuizApp_searchentry_fts"("MCQuizApp_searchentry_fts", rowid, body) '
+    "VALUES ('delete', old.id, old.body); "
+    'INSERT INTO "MCQuizApp_searchentry_fts"(rowid, body) VALUES (new.id, new.body); END',
+]
+SQLITE_REVERSE = [
+    'DROP TRIGGER IF EXISTS "MCQuizApp_searchentry_au"',
+    'DROP TRIGGER IF EXISTS "MCQuizApp_searchentry_ad"',
+    'DROP TRIGGER IF EXISTS "MCQuizApp_searchentry_ai"',
+    'DROP TABLE IF EXISTS "MCQuizApp_searchentry_fts"',
+]
+POSTGRESQL_FORWARD = [
+    'CREATE INDEX "MCQuizApp_searchentry_body_fts" ON "MCQuizApp_searchentry" '
+    "USING gin (to_tsvector('english', body))",
+]
+POSTGRESQL_REVERSE = [
+    'DROP INDEX IF EXISTS "MCQuizApp_searchentry_body_fts"',
+]
+
+
+def run_for_vendor(sqlite, postgresql):
+    def run(apps, schema_editor):
+        statements = {"sqlite": sqlite, "postgresql": postgresql}.get(
+            schema_editor.connection.vendor, [])
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MCQuizApp', '0006_submissions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('quiz', 'Quiz'), ('question', 'Question')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('body', models.TextField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_entry')],
+            },
+        ),
+        migrations.RunPython(
+            run_for_vendor(SQLITE_FORWARD, POSTGRESQL_FORWARD),
+            run_for_vendor(SQLITE_REVERSE, POSTGRESQL_REVERSE),
+        ),
+    ]
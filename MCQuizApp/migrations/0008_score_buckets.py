@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:58
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F
+
+
+def backfill_buckets(apps, schema_editor):
+    Submission = apps.get_model("MCQuizApp", "Submission")
+    ScoreBucket = apps.get_model("MCQuizApp", "ScoreBucket")
+    rows = (
+        Submission.objects.filter(total__gt=0)
+        .annotate(bucket=F("correct") * 100 / F("total"))
+        .order_by()
+        .values("quiz_id", "bucket")
+        .annotate(count=Count("pk"))
+    )
+    ScoreBucket.objects.bulk_create(
+        [ScoreBucket(quiz_id=row["quiz_id"], bucket=row["bucket"], count=row["count"])
+         for row in rows.iterator()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MCQuizApp', '0007_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.PositiveSmallIntegerField(validators=[django.core.validators.MaxValueValidator(100)])),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('quiz', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_buckets', to='MCQuizApp.quiz')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('quiz', 'bucket'), name='unique_quiz_score_bucket')],
+            },
+        ),
+        migrations.RunPython(backfill_buckets, migrations.RunPython.noop),
+    ]
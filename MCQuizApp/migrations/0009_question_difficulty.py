@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MCQuizApp', '0008_score_buckets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='difficulty',
+            field=models.FloatField(blank=True, editable=False, help_text='Calibrated item difficulty used by adaptive quizzes.', null=True, verbose_name='Difficulty'),
+        ),
+    ]
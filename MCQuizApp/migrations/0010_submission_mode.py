@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MCQuizApp', '0009_question_difficulty'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='mode',
+            field=models.CharField(choices=[('fixed', 'Fixed form'), ('adaptive', 'Adaptive')], default='fixed', max_length=10),
+        ),
+    ]
@@ -1,7 +1,78 @@
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Count, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.core.validators import MaxValueValidator
-from slugify import slugify as makeSlug
+
+from .rendering import slugify
+
+
+class QuizQuerySet(models.QuerySet):
+    """Set-based maintenance helpers for :class:`Quiz` rows."""
+
+    def open(self):
+        """Quizzes without an opening time or whose opening time has passed."""
+        return self.filter(
+            models.Q(opens_at__isnull=True) | models.Q(opens_at__lte=timezone.now()))
+
+    def refresh_question_counts(self):
+        """Recalculate ``number_of_questions`` for every quiz in one query.
+
+        Mirrors :meth:`Quiz.get_number_of_questions`: quizzes left without
+        answered questions are moved back to draft.
+        """
+        through = Question.quiz.through
+        answered = (
+            through.objects.filter(quiz=OuterRef("pk"), question__hasAnswer=True)
+            .order_by()
+            .values("quiz")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        updated = self.update(number_of_questions=Coalesce(Subquery(answered), 0))
+        self.filter(number_of_questions=0).update(draft=True)
+        return updated
+
+    def mark_live(self):
+        """Take every quiz in the queryset that has answered questions out of
+        draft, without compiling a snapshot.
+
+        Returns the number of quizzes marked as live.
+        """
+        self.refresh_question_counts()
+        return self.filter(number_of_questions__gt=0).update(draft=False)
+
+
+class QuestionQuerySet(models.QuerySet):
+    """Set-based maintenance helpers for :class:`Question` rows."""
+
+    def refresh_has_answer(self):
+        """Recompute ``hasAnswer`` from the related answers in one query."""
+        correct = Answer.objects.filter(question=OuterRef("pk"), correct=True)
+        return self.update(hasAnswer=Exists(correct))
+
+    def attach_to_quiz(self, quiz, batch_size=1000):
+        """Add every question in the queryset to ``quiz``.
+
+        Rows are inserted straight into the M2M table in batches, skipping
+        questions that already belong to the quiz. Returns the number of
+        questions processed.
+        """
+        through = Question.quiz.through
+        batch = []
+        processed = 0
+        for pk in self.values_list("pk", flat=True).iterator(chunk_size=batch_size):
+            batch.append(through(question_id=pk, quiz_id=quiz.pk))
+            if len(batch) >= batch_size:
+                through.objects.bulk_create(batch, ignore_conflicts=True)
+                processed += len(batch)
+                batch = []
+        if batch:
+            through.objects.bulk_create(batch, ignore_conflicts=True)
+            processed += len(batch)
+        Quiz.objects.filter(pk=quiz.pk).refresh_question_counts()
+        return processed
 
 
 class Quiz(models.Model):
@@ -21,6 +92,10 @@ class Quiz(models.Model):
         Percentage score required to pass the quiz. Must be <= 100.
     draft: :class:`~django.db.models.BooleanField`
         When ``True`` the quiz is hidden from public listings.
+    published_version: :class:`~django.db.models.PositiveIntegerField`
+        Version of the :class:`QuizSnapshot` served to students, if any.
+    opens_at: :class:`~django.db.models.DateTimeField`
+        Optional time before which the quiz is hidden from students.
     """
 
     title = models.CharField(
@@ -59,13 +134,32 @@ class Quiz(models.Model):
         verbose_name="Draft",
         help_text="Designates whether this quiz is unpublished.",
     )
+    published_version = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name="Published Version",
+        help_text="Snapshot version currently delivered to students.",
+    )
+    opens_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        db_index=True,
+        verbose_name="Opens At",
+        help_text="When set, the quiz is hidden until this time.",
+    )
+
+    objects = QuizQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Quiz"
         verbose_name_plural = "Quizzes"
+        indexes = [
+            models.Index(fields=["draft", "number_of_questions"]),
+        ]
 
     def save(self, *args, **kwargs):
-        self.url = makeSlug(self.title)
+        self.url = slugify(self.title)
         if self.pass_mark > 100:
             raise ValidationError('{} is above 100'.format(self.pass_mark))
         if self.id:
@@ -105,6 +199,8 @@ class Question(models.Model):
         Explanation displayed when showing solutions.
     hasAnswer: :class:`~django.db.models.BooleanField`
         Indicates whether the question currently has a correct answer.
+    difficulty: :class:`~django.db.models.FloatField`
+        Rasch difficulty fitted by ``manage.py calibrate_items``.
     """
 
     quiz = models.ManyToManyField(
@@ -138,6 +234,20 @@ class Question(models.Model):
         verbose_name="Has Answer",
         help_text="True if a correct answer exists for this question.",
     )
+    difficulty = models.FloatField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name="Difficulty",
+        help_text="Calibrated item difficulty used by adaptive quizzes.",
+    )
+
+    objects = QuestionQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["hasAnswer"]),
+        ]
 
     def save(self, *args, **kwargs):
         return super().save(*args, **kwargs)
@@ -204,6 +314,9 @@ class Answer(models.Model):
     class Meta:
         verbose_name = 'Answer'
         verbose_name_plural = 'Answers'
+        indexes = [
+            models.Index(fields=["question", "correct"]),
+        ]
 
     def save(self, *args, **kwargs):
         if self.correct:
@@ -213,3 +326,253 @@ class Answer(models.Model):
 
     def __str__(self):
         return self.content
+
+
+class QuizSnapshot(models.Model):
+    """Immutable compiled copy of a :class:`Quiz` used for delivery and grading.
+
+    Fields
+    ------
+    quiz: :class:`~django.db.models.ForeignKey`
+        The quiz this snapshot was compiled from.
+    version: :class:`~django.db.models.PositiveIntegerField`
+        Monotonically increasing version number per quiz.
+    payload: :class:`~django.db.models.BinaryField`
+        Compressed JSON containing questions, rendered content and answer key.
+    created: :class:`~django.db.models.DateTimeField`
+        When the snapshot was compiled.
+    """
+
+    quiz = models.ForeignKey(
+        Quiz,
+        related_name="snapshots",
+        on_delete=models.CASCADE,
+        verbose_name="Quiz",
+        help_text="Quiz this snapshot was compiled from.",
+    )
+    version = models.PositiveIntegerField(
+        verbose_name="Version",
+        help_text="Snapshot version number for the quiz.",
+    )
+    payload = models.BinaryField(
+        editable=False,
+        help_text="Compressed JSON payload of the compiled quiz.",
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Created",
+    )
+
+    class Meta:
+        verbose_name = "Quiz Snapshot"
+        verbose_name_plural = "Quiz Snapshots"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["quiz", "version"], name="unique_quiz_snapshot_version"),
+        ]
+
+    def __str__(self):
+        return "{} v{}".format(self.quiz, self.version)
+
+
+class RateLimitBucket(models.Model):
+    """Token bucket state for :class:`~MCQuizApp.ratelimit.DatabaseBackend`.
+
+    Fields
+    ------
+    key: :class:`~django.db.models.CharField`
+        View name and client identifier.
+    tokens: :class:`~django.db.models.FloatField`
+        Tokens left in the bucket at ``updated``.
+    updated: :class:`~django.db.models.FloatField`
+        Unix timestamp of the last request.
+    """
+
+    key = models.CharField(max_length=255, unique=True)
+    tokens = models.FloatField()
+    updated = models.FloatField()
+
+    def __str__(self):
+        return self.key
+
+
+class Submission(models.Model):
+    """A graded attempt at a :class:`Quiz`.
+
+    Fields
+    ------
+    quiz: :class:`~django.db.models.ForeignKey`
+        The quiz that was answered.
+    version: :class:`~django.db.models.PositiveIntegerField`
+        Snapshot version the attempt was graded against, if published.
+    attempt: :class:`~django.db.models.CharField`
+        Attempt token issued by the questions page.
+    guesses: :class:`~django.db.models.JSONField`
+        Mapping of question id to the chosen answer id (or ``null``).
+    correct: :class:`~django.db.models.PositiveIntegerField`
+        Number of correct answers.
+    total: :class:`~django.db.models.PositiveIntegerField`
+        Number of questions graded.
+    passed: :class:`~django.db.models.BooleanField`
+        Whether the score reached the quiz pass mark.
+    mode: :class:`~django.db.models.CharField`
+        ``fixed`` for the full question list, ``adaptive`` for adaptive
+        attempts. Only fixed-form submissions count towards
+        :class:`QuizStats` and the score histogram.
+    """
+
+    FIXED = "fixed"
+    ADAPTIVE = "adaptive"
+    MODE_CHOICES = [(FIXED, "Fixed form"), (ADAPTIVE, "Adaptive")]
+
+    quiz = models.ForeignKey(
+        Quiz,
+        related_name="submissions",
+        on_delete=models.CASCADE,
+        verbose_name="Quiz",
+    )
+    version = models.PositiveIntegerField(blank=True, null=True)
+    attempt = models.CharField(max_length=64, blank=True)
+    guesses = models.JSONField(default=dict)
+    correct = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    passed = models.BooleanField(default=False)
+    mode = models.CharField(max_length=10, choices=MODE_CHOICES, default=FIXED)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Submission"
+        verbose_name_plural = "Submissions"
+        indexes = [
+            models.Index(fields=["quiz", "id"]),
+        ]
+
+    def __str__(self):
+        return "{} ({}/{})".format(self.quiz, self.correct, self.total)
+
+
+class QuizStats(models.Model):
+    """Running totals of the fixed-form submissions for a :class:`Quiz`.
+
+    Fields
+    ------
+    quiz: :class:`~django.db.models.OneToOneField`
+        The quiz these totals belong to.
+    attempts: :class:`~django.db.models.PositiveIntegerField`
+        Number of graded submissions.
+    passes: :class:`~django.db.models.PositiveIntegerField`
+        Number of submissions that reached the pass mark.
+    correct: :class:`~django.db.models.PositiveIntegerField`
+        Sum of correct answers over all submissions.
+    """
+
+    quiz = models.OneToOneField(
+        Quiz,
+        primary_key=True,
+        related_name="stats",
+        on_delete=models.CASCADE,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    passes = models.PositiveIntegerField(default=0)
+    correct = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Quiz Statistics"
+        verbose_name_plural = "Quiz Statistics"
+
+    def __str__(self):
+        return str(self.quiz)
+
+
+class ScoreBucket(models.Model):
+    """One bar of a quiz's score histogram.
+
+    Scores are whole percentages, so each quiz has at most 101 buckets and
+    percentile and top-N lookups read a fixed number of rows.
+
+    Fields
+    ------
+    quiz: :class:`~django.db.models.ForeignKey`
+        The quiz the histogram belongs to.
+    bucket: :class:`~django.db.models.PositiveSmallIntegerField`
+        Score percentage, rounded down (0-100).
+    count: :class:`~django.db.models.PositiveIntegerField`
+        Number of submissions with that score.
+    """
+
+    quiz = models.ForeignKey(
+        Quiz,
+        related_name="score_buckets",
+        on_delete=models.CASCADE,
+    )
+    bucket = models.PositiveSmallIntegerField(validators=[MaxValueValidator(100)])
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["quiz", "bucket"], name="unique_quiz_score_bucket"),
+        ]
+
+    def __str__(self):
+        return "{} {}%: {}".format(self.quiz, self.bucket, self.count)
+
+
+class RegradeCheckpoint(models.Model):
+    """Progress of an interrupted ``manage.py regrade`` run.
+
+    Fields
+    ------
+    quiz: :class:`~django.db.models.OneToOneField`
+        The quiz being regraded.
+    answer_key: :class:`~django.db.models.CharField`
+        Hash of the answer key the run grades against.
+    last_id: :class:`~django.db.models.BigIntegerField`
+        Highest :class:`Submission` id already regraded.
+    """
+
+    quiz = models.OneToOneField(
+        Quiz,
+        primary_key=True,
+        on_delete=models.CASCADE,
+    )
+    answer_key = models.CharField(max_length=64)
+    last_id = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return "{} @ {}".format(self.quiz, self.last_id)
+
+
+class SearchEntry(models.Model):
+    """Text indexed for full-text search of quizzes and questions.
+
+    Rows are kept up to date by :mod:`MCQuizApp.signals`. The full-text
+    index itself is database specific (SQLite FTS5 table or PostgreSQL GIN
+    index) and is created by migration ``0007``.
+
+    Fields
+    ------
+    kind: :class:`~django.db.models.CharField`
+        Either ``"quiz"`` or ``"question"``.
+    object_id: :class:`~django.db.models.BigIntegerField`
+        Primary key of the indexed object.
+    body: :class:`~django.db.models.TextField`
+        Searchable text of the object.
+    """
+
+    QUIZ = "quiz"
+    QUESTION = "question"
+    KIND_CHOICES = [(QUIZ, "Quiz"), (QUESTION, "Question")]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    body = models.TextField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id"], name="unique_search_entry"),
+        ]
+
+    def __str__(self):
+        return "{} {}".format(self.kind, self.object_id)
@@ -0,0 +1,156 @@
+"""Per-client token-bucket rate limiting for the public quiz views.
+
+Rate limiting is off unless the ``MCQUIZ_RATE_LIMIT`` setting is given::
+
+    MCQUIZ_RATE_LIMIT = {
+        "BACKEND": "MCQuizApp.ratelimit.CacheBackend",
+        "RATE": 1.0,       # tokens added per second
+        "CAPACITY": 30,    # burst size
+        "KEY": "MCQuizApp.ratelimit.forwarded_client_key",
+    }
+
+``KEY`` is the dotted path of a function mapping a request to its bucket.
+The default, :func:`client_key`, uses ``REMOTE_ADDR``. Behind a reverse
+proxy or a NAT that address is shared by every student, so they would all
+share one bucket.
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache, wraps
+
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.module_loading import import_string
+
+from .cache import get_cache
+from .models import RateLimitBucket
+
+DEFAULTS = {
+    "BACKEND": "MCQuizApp.ratelimit.LocMemBackend",
+    "RATE": 1.0,
+    "CAPACITY": 30,
+    "KEY": "MCQuizApp.ratelimit.client_key",
+}
+
+
+def refill(tokens, updated, now, rate, capacity):
+    """Apply the token-bucket rule.
+
+    Returns ``(allowed, tokens)`` where ``tokens`` is the bucket level after
+    the request has been counted.
+    """
+    tokens = min(capacity, tokens + (now - updated) * rate)
+    if tokens >= 1:
+        return True, tokens - 1
+    return False, tokens
+
+
+class LocMemBackend:
+    """Buckets held in process memory. Limits apply per worker process."""
+
+    max_entries = 10000
+
+    def __init__(self):
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, rate, capacity):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            allowed, tokens = refill(tokens, updated, now, rate, capacity)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+        return allowed
+
+
+class CacheBackend:
+    """Buckets stored in the MCQuiz cache and shared between processes.
+
+    Reads and writes are not atomic, so concurrent requests from one client
+    may occasionally get an extra token.
+    """
+
+    def consume(self, key, rate, capacity):
+        cache = get_cache()
+        cache_key = "mcquiz:ratelimit:{}".format(key)
+        now = time.time()
+        tokens, updated = cache.get(cache_key, (capacity, now))
+        allowed, tokens = refill(tokens, updated, now, rate, capacity)
+        cache.set(cache_key, (tokens, now), int(capacity / rate) + 1)
+        return allowed
+
+
+class DatabaseBackend:
+    """Buckets stored in :class:`~MCQuizApp.models.RateLimitBucket` rows.
+
+    Exact across processes at the cost of a locked row update per request.
+    """
+
+    def consume(self, key, rate, capacity):
+        now = time.time()
+        with transaction.atomic():
+            bucket, _ = RateLimitBucket.objects.select_for_update().get_or_create(
+                key=key, defaults={"tokens": capacity, "updated": now})
+            allowed, bucket.tokens = refill(
+                bucket.tokens, bucket.updated, now, rate, capacity)
+            bucket.updated = now
+            bucket.save(update_fields=["tokens", "updated"])
+        return allowed
+
+
+@lru_cache(maxsize=None)
+def get_backend(path):
+    return import_string(path)()
+
+
+@lru_cache(maxsize=None)
+def get_key_function(path):
+    return import_string(path)
+
+
+def get_config():
+    """Return the rate limit settings merged with the defaults, or ``None``."""
+    config = getattr(settings, "MCQUIZ_RATE_LIMIT", None)
+    if config is None:
+        return None
+    return dict(DEFAULTS, **config)
+
+
+def client_key(request):
+    """Identify the client by ``REMOTE_ADDR``."""
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def forwarded_client_key(request):
+    """Identify the client by the address a trusted reverse proxy appended
+    to ``X-Forwarded-For``, falling back to ``REMOTE_ADDR``.
+
+    Only use this when every request passes through exactly one proxy that
+    sets the header; otherwise clients can choose their own bucket.
+    """
+    forwarded = request.META.get("HTTP_X_FORWARDED_FOR", "")
+    address = forwarded.rsplit(",", 1)[-1].strip()
+    return address or client_key(request)
+
+
+def rate_limit(view):
+    """Reject requests with HTTP 429 once a client's bucket is empty."""
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        config = get_config()
+        if config is not None:
+            key = "{}:{}".format(
+                view.__name__, get_key_function(config["KEY"])(request))
+            backend = get_backend(config["BACKEND"])
+            if not backend.consume(key, config["RATE"], config["CAPACITY"]):
+                response = HttpResponse("Too many requests.", status=429)
+                response["Retry-After"] = str(int(1 / config["RATE"]) + 1)
+                return response
+        return view(request, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,110 @@
+"""Compact, read-only objects used to deliver and grade quizzes.
+
+The views used to rebuild lists of dictionaries holding model instances on
+every request. These classes hold only what the templates and grading need,
+use ``__slots__`` to keep per-object memory low and are shared between
+requests through a per-process LRU keyed by ``(quiz id, snapshot version)``.
+Instances must be treated as immutable.
+"""
+from functools import lru_cache
+
+from django.conf import settings
+from django.shortcuts import get_object_or_404
+from django.utils.safestring import mark_safe
+
+from .models import Quiz, QuizSnapshot
+from .snapshots import compile_quiz, load_snapshot
+
+
+class AnswerView:
+    """A single answer option. ``id`` is a string to match submitted values."""
+
+    __slots__ = ("id", "content")
+
+    def __init__(self, id, content):
+        self.id = id
+        self.content = content
+
+
+class QuestionView:
+    """A deliverable question with its answer options and correct answer id."""
+
+    __slots__ = ("id", "figure", "content", "reason", "answers", "answer")
+
+    def __init__(self, id, figure, content, reason, answers, answer):
+        self.id = id
+        self.figure = figure
+        self.content = content
+        self.reason = reason
+        self.answers = answers
+        self.answer = answer
+
+
+class QuizView:
+    """A compiled quiz as served to students."""
+
+    __slots__ = ("id", "title", "url", "pass_mark", "version", "questions")
+
+    def __init__(self, id, title, url, pass_mark, version, questions):
+        self.id = id
+        self.title = title
+        self.url = url
+        self.pass_mark = pass_mark
+        self.version = version
+        self.questions = questions
+
+    @classmethod
+    def from_payload(cls, payload):
+        """Build a :class:`QuizView` from a snapshot payload."""
+        questions = tuple(
+            QuestionView(
+                question["id"],
+                question["figure"],
+                mark_safe(question["content"]),
+                mark_safe(question["reason"]),
+                tuple(
+                    AnswerView(str(answer["id"]), mark_safe(answer["content"]))
+                    for answer in question["answers"]
+                ),
+                None if question["answer"] is None else str(question["answer"]),
+            )
+            for question in payload["questions"]
+        )
+        return cls(
+            payload["id"],
+            payload["title"],
+            payload["url"],
+            payload["pass_mark"],
+            payload["version"],
+            questions,
+        )
+
+
+@lru_cache(maxsize=getattr(settings, "MCQUIZ_QUIZ_CACHE_SIZE", 256))
+def get_published_view(pk, version):
+    """Return the shared :class:`QuizView` for a published snapshot version."""
+    return QuizView.from_payload(load_snapshot(pk, version))
+
+
+def get_quiz_view(pk, version=None):
+    """Return the :class:`QuizView` delivery and grading should use.
+
+    ``version`` is the snapshot version a student was shown; grading an
+    attempt passes it so a republish mid-attempt does not change the answer
+    key. It falls back to the published version when that snapshot does not
+    exist.
+
+    Costs one query when the version is already cached in this process.
+    Unpublished quizzes are compiled from the live tables and are not
+    cached. Quizzes that have not opened yet raise
+    :class:`~django.http.Http404`.
+    """
+    quiz = get_object_or_404(Quiz.objects.open(), pk=pk)
+    if version is not None and version != quiz.published_version:
+        try:
+            return get_published_view(quiz.pk, version)
+        except QuizSnapshot.DoesNotExist:
+            pass
+    if quiz.published_version is None:
+        return QuizView.from_payload(compile_quiz(quiz))
+    return get_published_view(quiz.pk, quiz.published_version)
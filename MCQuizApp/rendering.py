@@ -0,0 +1,51 @@
+"""Pluggable text rendering, imported on first use.
+
+``MCQUIZ_LATEX_RENDERER`` and ``MCQUIZ_SLUGIFY`` name the functions used to
+render question content and to build quiz URLs, as dotted paths. Neither is
+imported until it is first called, so processes that never publish a quiz or
+save a title -- health checks, API-only workers -- do not load them.
+"""
+from functools import lru_cache
+
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils.module_loading import import_string
+
+LATEX_RENDERER = "MCQuizApp.rendering.latexify_renderer"
+SLUGIFY = "slugify.slugify"
+SLUGIFY_FALLBACK = "django.utils.text.slugify"
+
+
+@lru_cache(maxsize=None)
+def load(path, fallback=None):
+    """Import ``path``, or ``fallback`` when ``path`` is not installed."""
+    try:
+        return import_string(path)
+    except ImportError:
+        if fallback is None:
+            raise
+        return import_string(fallback)
+
+
+def latexify_renderer(text):
+    """Render ``text`` the same way ``{% latexify text parse_math=True %}`` does."""
+    from latexify.templatetags.latexify import latexify
+
+    return render_to_string("latexify/latexify.html", latexify(text, parse_math=True))
+
+
+def render_latex(text):
+    """Render ``text`` with the configured LaTeX renderer.
+
+    Used when compiling snapshots so the LaTeX markup is produced once at
+    publish time instead of on every request.
+    """
+    return load(getattr(settings, "MCQUIZ_LATEX_RENDERER", LATEX_RENDERER))(text)
+
+
+def slugify(text):
+    """Slugify ``text`` with python-slugify, or Django's slugify without it."""
+    path = getattr(settings, "MCQUIZ_SLUGIFY", None)
+    if path is None:
+        return load(SLUGIFY, SLUGIFY_FALLBACK)(text)
+    return load(path)(text)
@@ -0,0 +1,114 @@
+"""Full-text search over quizzes and questions.
+
+Searchable text is stored in :class:`~MCQuizApp.models.SearchEntry` rows and
+indexed by the database: an FTS5 table on SQLite and a GIN ``tsvector``
+index on PostgreSQL (see migration ``0007``). Other backends fall back to
+``icontains`` matching. Every search term is matched as a prefix, so
+``"integ"`` finds ``"integral"``.
+"""
+import re
+
+from django.db import connections
+from django.db.models.expressions import RawSQL
+
+from .models import Answer, Question, SearchEntry
+
+SEARCH_CONFIG = "english"
+
+
+def quiz_document(quiz):
+    return "\n".join(part for part in (quiz.title, quiz.description) if part)
+
+
+def question_document(question, answers=None):
+    """Searchable text of ``question``; ``answers`` are the answer contents,
+    read from the database when not given."""
+    if answers is None:
+        answers = Answer.objects.filter(question=question).values_list("content", flat=True)
+    return "\n".join(
+        part for part in (question.content, question.reason, *answers) if part)
+
+
+def iter_question_documents(chunk_size=2000):
+    """Yield ``(question id, document)`` for every question in id order.
+
+    Answers are streamed alongside the questions, as in
+    :func:`MCQuizApp.dedup.iter_fingerprints`, so the whole bank is read
+    with two queries per chunk instead of one per question.
+    """
+    answers = (
+        Answer.objects.order_by("question_id", "pk")
+        .values_list("question_id", "content")
+        .iterator(chunk_size=chunk_size)
+    )
+    pending = next(answers, None)
+    questions = (
+        Question.objects.order_by("pk")
+        .only("pk", "content", "reason")
+        .iterator(chunk_size=chunk_size)
+    )
+    for question in questions:
+        options = []
+        while pending is not None and pending[0] <= question.pk:
+            if pending[0] == question.pk:
+                options.append(pending[1])
+            pending = next(answers, None)
+        yield question.pk, question_document(question, options)
+
+
+def index_quiz(quiz):
+    SearchEntry.objects.update_or_create(
+        kind=SearchEntry.QUIZ, object_id=quiz.pk,
+        defaults={"body": quiz_document(quiz)})
+
+
+def index_question(question):
+    SearchEntry.objects.update_or_create(
+        kind=SearchEntry.QUESTION, object_id=question.pk,
+        defaults={"body": question_document(question)})
+
+
+def remove(kind, pk):
+    SearchEntry.objects.filter(kind=kind, object_id=pk).delete()
+
+
+def terms(query):
+    """Split ``query`` into words that are safe to put in a match expression."""
+    return re.findall(r"\w+", query)
+
+
+def matching_ids(kind, query, using="default"):
+    """Return an expression selecting the ids of ``kind`` objects matching ``query``.
+
+    The result can be used as the value of an ``__in`` lookup, so matches
+    are filtered inside the database rather than loaded into Python.
+    """
+    words = terms(query)
+    if not words:
+        return SearchEntry.objects.none().values("object_id")
+    vendor = connections[using].vendor
+    if vendor == "sqlite":
+        return RawSQL(
+            'SELECT e.object_id FROM "MCQuizApp_searchentry_fts" f '
+            'JOIN "MCQuizApp_searchentry" e ON e.id = f.rowid '
+            'WHERE f."MCQuizApp_searchentry_fts" MATCH %s AND e.kind = %s',
+            (" ".join('"{}"*'.format(word) for word in words), kind),
+        )
+    if vendor == "postgresql":
+        return RawSQL(
+            'SELECT object_id FROM "MCQuizApp_searchentry" '
+            "WHERE kind = %s AND to_tsvector(%s, body) @@ to_tsquery(%s, %s)",
+            (kind, SEARCH_CONFIG, SEARCH_CONFIG,
+             " & ".join("{}:*".format(word) for word in words)),
+        )
+    entries = SearchEntry.objects.filter(kind=kind)
+    for word in words:
+        entries = entries.filter(body__icontains=word)
+    return entries.values("object_id")
+
+
+def filter_queryset(queryset, kind, query, field="pk"):
+    """Restrict ``queryset`` to rows whose ``field`` is the id of a ``kind``
+    object matching ``query``."""
+    return queryset.filter(
+        **{"{}__in".format(field): matching_ids(kind, query, queryset.db)})
@@ -0,0 +1,37 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import search
+from .models import Answer, Question, Quiz, SearchEntry
+
+
+@receiver(post_save, sender=Quiz)
+def index_quiz(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_quiz(instance)
+
+
+@receiver(post_save, sender=Question)
+def index_question(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_question(instance)
+
+
+@receiver(post_save, sender=Answer)
+@receiver(post_delete, sender=Answer)
+def index_answer_question(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    question = Question.objects.filter(pk=instance.question_id).first()
+    if question is not None:
+        search.index_question(question)
+
+
+@receiver(post_delete, sender=Quiz)
+def remove_quiz(sender, instance, **kwargs):
+    search.remove(SearchEntry.QUIZ, instance.pk)
+
+
+@receiver(post_delete, sender=Question)
+def remove_question(sender, instance, **kwargs):
+    search.remove(SearchEntry.QUESTION, instance.pk)
@@ -0,0 +1,133 @@
+"""Compile quizzes into immutable, versioned snapshots.
+
+A snapshot holds everything needed to deliver and grade a quiz -- question
+and answer content with LaTeX already rendered, figure URLs and the answer
+key -- as a single compressed JSON blob. Publishing a new version is atomic:
+the snapshot row and the ``Quiz.published_version`` pointer are written in
+one transaction, so students either see the old version or the new one.
+"""
+import json
+import zlib
+
+from django.db import transaction
+from django.db.models import Max, Prefetch
+
+from .cache import get_or_build, snapshot_key
+from .models import Answer, Quiz, QuizSnapshot
+from .rendering import render_latex
+
+
+def compile_quiz(quiz):
+    """Build the snapshot payload for ``quiz`` from the live tables.
+
+    Only questions with a correct answer are included, mirroring
+    :meth:`Quiz.get_questions`. ``hasAnswer`` can be stale, so questions
+    whose answers are all marked wrong are skipped too, as in
+    :func:`answer_key`.
+    """
+    questions = (
+        quiz.question_set.filter(hasAnswer=True)
+        .order_by("pk")
+        .prefetch_related(
+            Prefetch("answer_set", queryset=Answer.objects.order_by("pk")))
+    )
+    data = []
+    for question in questions:
+        answers = list(question.answer_set.all())
+        correct = next((answer.pk for answer in answers if answer.correct), None)
+        if correct is None:
+            continue
+        data.append(
+            {
+                "id": question.pk,
+                "figure": question.figure.url if question.figure else None,
+                "content": render_latex(question.content),
+                "reason": render_latex(question.reason) if question.reason else "",
+                "answers": [
+                    {"id": answer.pk, "content": render_latex(answer.content)}
+                    for answer in answers
+                ],
+                "answer": correct,
+            }
+        )
+    return {
+        "id": quiz.pk,
+        "title": quiz.title,
+        "url": quiz.url,
+        "pass_mark": quiz.pass_mark,
+        "version": quiz.published_version,
+        "questions": data,
+    }
+
+
+def answer_key(quiz):
+    """Return ``{question id: correct answer id}`` for ``quiz`` from the live tables.
+
+    Ids are strings, matching submitted guesses. Like :func:`compile_quiz`,
+    only answered questions are included and the first correct answer wins.
+    """
+    key = {}
+    rows = (
+        Answer.objects.filter(question__quiz=quiz, question__hasAnswer=True, correct=True)
+        .order_by("question_id", "pk")
+        .values_list("question_id", "pk")
+    )
+    for question_id, answer_id in rows:
+        key.setdefault(str(question_id), str(answer_id))
+    return key
+
+
+def payload_answer_key(payload):
+    """Return the answer key stored in a snapshot payload, shaped like
+    :func:`answer_key`."""
+    return {
+        str(question["id"]): str(question["answer"])
+        for question in payload["questions"]
+        if question["answer"] is not None
+    }
+
+
+def dumps(payload):
+    """Serialize a payload to the compressed blob stored on the snapshot."""
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+def loads(blob):
+    """Inverse of :func:`dumps`."""
+    return json.loads(zlib.decompress(bytes(blob)).decode("utf-8"))
+
+
+def publish_quiz(quiz):
+    """Compile ``quiz`` and make the result the version served to students.
+
+    Returns the new :class:`~MCQuizApp.models.QuizSnapshot`.
+    """
+    with transaction.atomic():
+        quiz = Quiz.objects.select_for_update().get(pk=quiz.pk)
+        latest = quiz.snapshots.aggregate(latest=Max("version"))["latest"] or 0
+        quiz.published_version = latest + 1
+        snapshot = QuizSnapshot.objects.create(
+            quiz=quiz,
+            version=quiz.published_version,
+            payload=dumps(compile_quiz(quiz)),
+        )
+        Quiz.objects.filter(pk=quiz.pk).update(
+            published_version=quiz.published_version)
+    return snapshot
+
+
+def load_snapshot(pk, version):
+    """Return the payload of version ``version`` of quiz ``pk``.
+
+    The compressed blob is kept in the shared cache, so only the first
+    worker to miss reads it from the database.
+    """
+    blob = get_or_build(
+        snapshot_key(pk, version),
+        lambda: bytes(
+            QuizSnapshot.objects.filter(quiz_id=pk, version=version)
+            .values_list("payload", flat=True)
+            .get()
+        ),
+    )
+    return loads(blob)
@@ -0,0 +1,92 @@
+"""Normalization, identity and storage of quiz submissions.
+
+A submission is the set of guesses sent to the ``solutions`` view. Two
+requests carrying the same guesses for the same attempt of the same snapshot
+version are the same submission, which lets refreshes and double clicks
+reuse the first result.
+"""
+import hashlib
+import json
+
+from django.core import signing
+from django.db.models import F
+
+from .grading import has_passed
+from .leaderboard import record_score
+from .models import QuizStats, Submission
+
+
+def normalize_guesses(quiz, params):
+    """Map each question of ``quiz`` to the submitted answer id or ``None``.
+
+    ``params`` is the request's query dict; unrelated parameters are ignored.
+    """
+    return {str(question.id): params.get(str(question.id)) for question in quiz.questions}
+
+
+def sign_version(attempt, version):
+    """Return a token binding snapshot ``version`` to the ``attempt`` token.
+
+    The questions page puts it in the form so grading can use the version
+    the student was shown without trusting a version sent by the client.
+    """
+    return signing.Signer(salt="mcquiz.version").sign("{}:{}".format(attempt, version))
+
+
+def signed_version(params):
+    """Return the version signed for the request's ``attempt``, or ``None``
+    if the token is missing, forged or issued for another attempt."""
+    try:
+        value = signing.Signer(salt="mcquiz.version").unsign(params.get("version", ""))
+    except signing.BadSignature:
+        return None
+    attempt, _, version = value.rpartition(":")
+    if attempt != params.get("attempt", "")[:64]:
+        return None
+    return int(version)
+
+
+def submission_key(quiz, guesses, attempt):
+    """Return the cache key identifying a submission of ``guesses``."""
+    return result_key(quiz.id, quiz.version, guesses, attempt)
+
+
+def result_key(quiz_id, version, guesses, attempt):
+    """:func:`submission_key` from stored values, e.g. a
+    :class:`~MCQuizApp.models.Submission` row."""
+    raw = json.dumps(
+        [quiz_id, version, attempt, sorted(guesses.items())],
+        separators=(",", ":"),
+    )
+    return "mcquiz:result:{}".format(hashlib.sha256(raw.encode("utf-8")).hexdigest())
+
+
+def record_submission(quiz, guesses, attempt, correct, mode=Submission.FIXED):
+    """Store a graded submission. Fixed-form submissions are also added to
+    the quiz's running totals and score histogram; adaptive ones are not,
+    as they answer a different subset of questions."""
+    total = len(guesses)
+    passed = has_passed(correct, total, quiz.pass_mark)
+    submission = Submission.objects.create(
+        quiz_id=quiz.id,
+        version=quiz.version,
+        attempt=attempt,
+        guesses=guesses,
+        correct=correct,
+        total=total,
+        passed=passed,
+        mode=mode,
+    )
+    if mode != Submission.FIXED:
+        return submission
+    stats = QuizStats.objects.filter(quiz_id=quiz.id)
+    changes = {
+        "attempts": F("attempts") + 1,
+        "passes": F("passes") + int(passed),
+        "correct": F("correct") + correct,
+    }
+    if not stats.update(**changes):
+        QuizStats.objects.get_or_create(quiz_id=quiz.id)
+        stats.update(**changes)
+    record_score(quiz.id, correct, total)
+    return submission
@@ -0,0 +1,77 @@
+"""Helpers for asserting how much work a view does.
+
+:func:`query_budget` fails a test when the wrapped code runs more queries,
+or takes longer, than declared. The factories build large quizzes with bulk
+inserts so budgets can be checked at several quiz sizes cheaply.
+"""
+import time
+from contextlib import ContextDecorator
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+from ..models import Quiz, Question, Answer
+
+
+class query_budget(ContextDecorator):
+    """Assert that a block runs at most ``queries`` queries in ``seconds``.
+
+    Usable as a context manager or as a decorator::
+
+        with query_budget(queries=2, seconds=0.5):
+            self.client.get(url)
+    """
+
+    def __init__(self, queries, seconds=None, using=DEFAULT_DB_ALIAS):
+        self.queries = queries
+        self.seconds = seconds
+        self.using = using
+
+    def __enter__(self):
+        self.capture = CaptureQueriesContext(connections[self.using])
+        self.capture.__enter__()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.elapsed = time.perf_counter() - self.start
+        self.capture.__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            return False
+        executed = len(self.capture)
+        if executed > self.queries:
+            raise AssertionError("{} queries executed, budget is {}:\n{}".format(
+                executed, self.queries,
+                "\n".join("  " + query["sql"] for query in self.capture.captured_queries)))
+        if self.seconds is not None and self.elapsed > self.seconds:
+            raise AssertionError("Took {:.3f}s, budget is {:.3f}s.".format(
+                self.elapsed, self.seconds))
+        return False
+
+
+def make_quiz(n_questions, n_answers=4, title="Budget Quiz"):
+    """Create a quiz with ``n_questions`` answered questions using bulk inserts.
+
+    The first answer of every question is the correct one.
+    """
+    quiz = Quiz.objects.create(title=title, description="Generated quiz")
+    questions = Question.objects.bulk_create(
+        [Question(content="Question {}".format(i), hasAnswer=True)
+         for i in range(n_questions)])
+    through = Question.quiz.through
+    through.objects.bulk_create(
+        [through(question_id=question.pk, quiz_id=quiz.pk) for question in questions])
+    Answer.objects.bulk_create(
+        [Answer(question=question, content="Answer {}".format(j), correct=j == 0)
+         for question in questions for j in range(n_answers)])
+    Quiz.objects.filter(pk=quiz.pk).mark_live()
+    quiz.refresh_from_db()
+    return quiz
+
+
+def correct_guesses(quiz):
+    """Query parameters answering every question of ``quiz`` correctly."""
+    return {
+        str(question_id): str(answer_id)
+        for question_id, answer_id in Answer.objects.filter(
+            question__quiz=quiz, correct=True).values_list("question_id", "pk")
+    }
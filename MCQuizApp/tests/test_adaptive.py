@@ -0,0 +1,181 @@
+import time
+from array import array
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from ..adaptive import ItemIndex, estimate_ability, fit_difficulties
+from ..models import Quiz, Question, Answer, QuizStats, ScoreBucket, Submission
+from ..readmodel import AnswerView, QuestionView, QuizView
+
+
+def quiz_view(n):
+    questions = tuple(
+        QuestionView(pk, None, "q", "", (AnswerView("1", "a"),), "1")
+        for pk in range(1, n + 1))
+    return QuizView(1, "Quiz", "quiz", 0, None, questions)
+
+
+class AbilityTests(SimpleTestCase):
+    """Tests for :func:`~MCQuizApp.adaptive.estimate_ability`."""
+
+    def test_prior_mean_without_responses(self):
+        self.assertAlmostEqual(estimate_ability([]), 0.0)
+
+    def test_estimate_follows_responses(self):
+        right = estimate_ability([(0.0, True), (1.0, True)])
+        wrong = estimate_ability([(0.0, False), (-1.0, False)])
+        self.assertGreater(right, 0.5)
+        self.assertLess(wrong, -0.5)
+
+
+class ItemIndexTests(SimpleTestCase):
+    """Tests for :class:`~MCQuizApp.adaptive.ItemIndex`."""
+
+    def setUp(self):
+        self.index = ItemIndex(quiz_view(5), {1: -2.0, 2: -1.0, 3: 0.0, 4: 1.0, 5: 2.0})
+
+    def test_picks_closest_difficulty(self):
+        self.assertEqual(self.index.next_item(0.9, set()), 4)
+        self.assertEqual(self.index.next_item(-5, set()), 1)
+
+    def test_skips_administered_items(self):
+        self.assertEqual(self.index.next_item(0.9, {4}), 3)
+        self.assertIsNone(self.index.next_item(0, {1, 2, 3, 4, 5}))
+
+    def test_selection_is_fast_for_large_pools(self):
+        """
+        This test ensures that choosing the next item in a pool of thousands of
+        questions takes well under a millisecond.
+        """
+        n = 5000
+        index = ItemIndex(quiz_view(n), {pk: (pk - n / 2) / 1000 for pk in range(1, n + 1)})
+        administered = set(range(2400, 2600))
+        start = time.perf_counter()
+        for _ in range(100):
+            index.next_item(0.0, administered)
+        self.assertLess((time.perf_counter() - start) / 100, 0.001)
+
+
+class FitDifficultiesTests(SimpleTestCase):
+
+    def test_easy_items_get_lower_difficulty(self):
+        # Item 0 is answered correctly by everyone but one, item 1 by one person.
+        offsets, items, responses = array("q", [0]), array("l"), array("b")
+        for person in range(10):
+            items.extend([0, 1])
+            responses.extend([int(person != 0), int(person == 0)])
+            offsets.append(len(items))
+        difficulties, counts = fit_difficulties(offsets, items, responses, 2)
+        self.assertLess(difficulties[0], difficulties[1])
+        self.assertEqual(list(counts), [10, 10])
+
+
+def create_adaptive_quiz(n):
+    quiz = Quiz.objects.create(title="Adaptive", description="Desc")
+    for i in range(n):
+        question = Question.objects.create(content="Question {}".format(i))
+        question.quiz.add(quiz)
+        Answer.objects.create(question=question, content="right", correct=True)
+        Answer.objects.create(question=question, content="wrong")
+    return quiz
+
+
+@override_settings(MCQUIZ_ADAPTIVE_LENGTH=2)
+class AdaptiveViewTests(TestCase):
+    """
+    This deals with all tests related to the adaptive_view function in views.py.
+    name='adaptive'
+    """
+
+    def setUp(self):
+        self.quiz = create_adaptive_quiz(3)
+        self.url = reverse("mcquiz:adaptive", args=(self.quiz.pk, self.quiz.url))
+
+    def answer_current(self, correct=True):
+        response = self.client.get(self.url)
+        question = response.context["question"]
+        answer = question.answer if correct else next(
+            a.id for a in question.answers if a.id != question.answer)
+        return self.client.post(self.url, {"answer": answer})
+
+    def test_attempt_is_recorded_when_finished(self):
+        """
+        This test ensures that an adaptive attempt stops after the configured number
+        of questions and is stored as a submission.
+        """
+        self.assertEqual(self.answer_current().status_code, 302)
+        self.answer_current(correct=False)
+        response = self.client.get(self.url)
+        self.assertIsNone(response.context["question"])
+        self.assertEqual(response.context["correct"], 1)
+        self.assertContains(response, "Ability Estimate")
+        submission = Submission.objects.get()
+        self.assertEqual((submission.correct, submission.total), (1, 2))
+        self.assertEqual(submission.mode, Submission.ADAPTIVE)
+
+    def test_attempt_restarts_when_a_question_is_removed(self):
+        """
+        This test ensures that an attempt on an unpublished quiz starts over
+        instead of failing when a question it already used is deleted.
+        """
+        session_key = "mcquiz_adaptive_{}".format(self.quiz.pk)
+        self.answer_current()
+        Question.objects.filter(pk__in=self.client.session[session_key]["items"]).delete()
+        self.assertEqual(self.answer_current().status_code, 302)
+        self.assertEqual(len(self.client.session[session_key]["items"]), 1)
+        self.assertFalse(Submission.objects.exists())
+
+    def test_current_question_removed_mid_attempt(self):
+        """
+        This test ensures that answering a question deleted after it was shown
+        restarts the attempt instead of failing.
+        """
+        question = self.client.get(self.url).context["question"]
+        Question.objects.get(pk=question.id).delete()
+        response = self.client.post(self.url, {"answer": question.answer})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.context["question"].id, question.id)
+
+    def test_attempt_is_not_counted_in_fixed_form_statistics(self):
+        """
+        This test ensures that adaptive attempts do not change the statistics and
+        score histogram used for the fixed-form results page.
+        """
+        self.answer_current()
+        self.answer_current()
+        self.assertFalse(QuizStats.objects.filter(quiz=self.quiz).exists())
+        self.assertFalse(ScoreBucket.objects.filter(quiz=self.quiz).exists())
+
+    def test_questions_are_not_repeated(self):
+        first = self.client.get(self.url).context["question"]
+        self.answer_current()
+        second = self.client.get(self.url).context["question"]
+        self.assertNotEqual(first.id, second.id)
+
+    def test_restart(self):
+        self.answer_current()
+        response = self.client.get(self.url, {"restart": 1})
+        self.assertEqual(response.context["number"], 1)
+
+
+class CalibrateItemsCommandTests(TestCase):
+    """Tests for ``manage.py calibrate_items``."""
+
+    def test_calibration_orders_questions_by_difficulty(self):
+        quiz = create_adaptive_quiz(2)
+        easy, hard = quiz.question_set.order_by("pk")
+        easy_right = str(easy.answer_set.get(correct=True).pk)
+        hard_right = str(hard.answer_set.get(correct=True).pk)
+        for person in range(25):
+            Submission.objects.create(
+                quiz=quiz, total=2,
+                guesses={
+                    str(easy.pk): easy_right if person % 5 else None,
+                    str(hard.pk): hard_right if person % 5 == 0 else None,
+                })
+        call_command("calibrate_items", stdout=StringIO())
+        easy.refresh_from_db()
+        hard.refresh_from_db()
+        self.assertLess(easy.difficulty, hard.difficulty)
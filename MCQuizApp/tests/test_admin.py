@@ -0,0 +1,144 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from ..models import Quiz, Question, Answer
+
+
+class QuerySetMaintenanceTests(TestCase):
+    """Tests for the set-based helpers used by the admin actions."""
+
+    def setUp(self):
+        self.quiz = Quiz.objects.create(title="Bulk Quiz", description="Desc")
+        self.p1 = Question.objects.create(content="question 1")
+        self.p2 = Question.objects.create(content="question 2")
+        Answer.objects.create(question=self.p1, content="answer", correct=True)
+        Question.objects.filter(pk=self.p2.pk).update(hasAnswer=True)
+
+    def test_refresh_has_answer(self):
+        """
+        This test ensures that hasAnswer is recomputed from the answers in the database.
+        """
+        Question.objects.all().refresh_has_answer()
+        self.assertQuerySetEqual(
+            Question.objects.filter(hasAnswer=True), [self.p1])
+
+    def test_attach_to_quiz_skips_existing_rows(self):
+        """
+        This test ensures that attaching questions twice does not duplicate them
+        and that the quiz question count is updated.
+        """
+        self.p1.quiz.add(self.quiz)
+        Question.objects.all().attach_to_quiz(self.quiz)
+        self.assertEqual(self.quiz.question_set.count(), 2)
+        self.quiz.refresh_from_db()
+        self.assertEqual(self.quiz.number_of_questions, 2)
+
+    def test_mark_live(self):
+        """
+        This test ensures that only quizzes with answered questions are marked as live.
+        """
+        empty = Quiz.objects.create(title="Empty", description="Desc", draft=True)
+        self.quiz.draft = True
+        self.quiz.save()
+        self.p1.quiz.add(self.quiz)
+        published = Quiz.objects.all().mark_live()
+        self.assertEqual(published, 1)
+        self.quiz.refresh_from_db()
+        empty.refresh_from_db()
+        self.assertIs(self.quiz.draft, False)
+        self.assertIs(empty.draft, True)
+
+
+class AdminActionTests(TestCase):
+    """Tests for the actions registered in :mod:`MCQuizApp.admin`."""
+
+    def setUp(self):
+        user = get_user_model().objects.create_superuser(
+            "admin", "admin@example.com", "password")
+        self.client.force_login(user)
+        self.quiz = Quiz.objects.create(title="Admin Quiz", description="Desc")
+        self.question = Question.objects.create(content="question", hasAnswer=True)
+
+    def test_changelists_load(self):
+        for model in ("quiz", "question", "answer"):
+            response = self.client.get(
+                reverse("admin:MCQuizApp_{}_changelist".format(model)))
+            self.assertEqual(response.status_code, 200)
+
+    def test_attach_to_quiz_action(self):
+        response = self.client.post(
+            reverse("admin:MCQuizApp_question_changelist"),
+            {
+                "action": "attach_to_quiz",
+                "quiz": self.quiz.pk,
+                "_selected_action": [self.question.pk],
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertQuerySetEqual(self.quiz.question_set.all(), [self.question])
+
+    def test_attach_to_quiz_action_without_quiz(self):
+        self.client.post(
+            reverse("admin:MCQuizApp_question_changelist"),
+            {"action": "attach_to_quiz", "_selected_action": [self.question.pk]},
+        )
+        self.assertFalse(self.quiz.question_set.exists())
+
+    def test_quiz_autocomplete(self):
+        response = self.client.get(
+            reverse("admin:autocomplete"),
+            {
+                "term": "Admin",
+                "app_label": "MCQuizApp",
+                "model_name": "question",
+                "field_name": "quiz",
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Admin Quiz")
+
+    def test_publish_snapshot_action_skips_quizzes_without_questions(self):
+        """
+        This test ensures that the publish action refuses quizzes without answered
+        questions and names them to the user.
+        """
+        empty = Quiz.objects.create(title="Empty Quiz", description="Desc", draft=True)
+        response = self.client.post(
+            reverse("admin:MCQuizApp_quiz_changelist"),
+            {"action": "publish_snapshot", "_selected_action": [empty.pk]},
+            follow=True,
+        )
+        empty.refresh_from_db()
+        self.assertIsNone(empty.published_version)
+        self.assertIs(empty.draft, True)
+        self.assertContains(response, "Skipped Empty Quiz")
+
+    def test_publish_snapshot_action_takes_quiz_out_of_draft(self):
+        """
+        This test ensures that the publish action compiles a snapshot and clears
+        the draft flag, so one action fully publishes a quiz.
+        """
+        self.question.quiz.add(self.quiz)
+        Answer.objects.create(question=self.question, content="answer", correct=True)
+        Quiz.objects.filter(pk=self.quiz.pk).update(draft=True)
+        self.client.post(
+            reverse("admin:MCQuizApp_quiz_changelist"),
+            {"action": "publish_snapshot", "_selected_action": [self.quiz.pk]},
+        )
+        self.quiz.refresh_from_db()
+        self.assertEqual(self.quiz.published_version, 1)
+        self.assertIs(self.quiz.draft, False)
+
+    def test_answer_search_uses_question_index(self):
+        """
+        This test ensures that the answer changelist is searched through the
+        question search entries, which include the answer text.
+        """
+        Answer.objects.create(question=self.question, content="Logarithm", correct=True)
+        other = Question.objects.create(content="other")
+        Answer.objects.create(question=other, content="Exponential")
+        response = self.client.get(
+            reverse("admin:MCQuizApp_answer_changelist"), {"q": "logar"})
+        self.assertEqual(
+            [answer.content for answer in response.context["cl"].result_list],
+            ["Logarithm"])
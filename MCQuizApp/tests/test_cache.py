@@ -0,0 +1,80 @@
+import threading
+import time
+
+from django.test import SimpleTestCase
+from ..cache import _LOCKS, get_cache, get_or_build
+
+
+class GetOrBuildTests(SimpleTestCase):
+    """Tests for :func:`~MCQuizApp.cache.get_or_build`."""
+
+    def setUp(self):
+        get_cache().clear()
+
+    def test_miss_then_hit(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return "value"
+
+        self.assertEqual(get_or_build("mcquiz:test", build), "value")
+        self.assertEqual(get_or_build("mcquiz:test", build), "value")
+        self.assertEqual(len(calls), 1)
+
+    def test_concurrent_misses_build_once(self):
+        """
+        This test ensures that concurrent misses on the same key only run the builder once.
+        """
+        calls = []
+        results = []
+
+        def build():
+            calls.append(1)
+            time.sleep(0.05)
+            return "value"
+
+        def worker():
+            results.append(get_or_build("mcquiz:herd", build, poll_interval=0.01))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 8)
+
+    def test_waits_for_other_process(self):
+        """
+        This test ensures that a caller waits for a value built under another
+        process's lock instead of rebuilding it.
+        """
+        cache = get_cache()
+        cache.add("mcquiz:remote:lock", 1, 30)
+        threading.Timer(0.05, cache.set, ("mcquiz:remote", "remote")).start()
+        value = get_or_build(
+            "mcquiz:remote", lambda: "local", poll_interval=0.01)
+        self.assertEqual(value, "remote")
+
+    def test_waiting_does_not_block_other_keys_on_stripe(self):
+        """
+        This test ensures that a thread waiting for another process's build does
+        not hold the in-process lock shared with other keys.
+        """
+        slow = "mcquiz:slow"
+        stripe = hash(slow) % len(_LOCKS)
+        other = next(
+            key for key in ("mcquiz:other:{}".format(i) for i in range(10000))
+            if hash(key) % len(_LOCKS) == stripe)
+        cache = get_cache()
+        cache.add("{}:lock".format(slow), 1, 30)
+        waiter = threading.Thread(
+            target=get_or_build, args=(slow, lambda: "local"),
+            kwargs={"lock_timeout": 1, "poll_interval": 0.01})
+        waiter.start()
+        time.sleep(0.05)
+        start = time.monotonic()
+        self.assertEqual(get_or_build(other, lambda: "other"), "other")
+        self.assertLess(time.monotonic() - start, 0.5)
+        waiter.join()
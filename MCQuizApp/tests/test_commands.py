@@ -0,0 +1,237 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from ..cache import get_cache, snapshot_key
+from ..grading import key_digest
+from ..management.commands.importtime import parse_importtime
+from ..models import (
+    Quiz, Question, Answer, QuizStats, RegradeCheckpoint, ScoreBucket, Submission)
+from ..snapshots import answer_key, publish_quiz
+from ..submissions import result_key
+
+
+def create_quiz(title, opens_at=None):
+    quiz = Quiz.objects.create(title=title, description="Desc", opens_at=opens_at)
+    question = Question.objects.create(content="{} question".format(title))
+    question.quiz.add(quiz)
+    Answer.objects.create(question=question, content="answer", correct=True)
+    return quiz
+
+
+class WarmQuizCommandTests(TestCase):
+    """Tests for ``manage.py warm_quiz``."""
+
+    def setUp(self):
+        get_cache().clear()
+
+    def test_requires_target(self):
+        with self.assertRaises(CommandError):
+            call_command("warm_quiz")
+
+    def test_warms_published_quiz(self):
+        quiz = create_quiz("Published")
+        snapshot = publish_quiz(quiz)
+        call_command("warm_quiz", quiz.pk, stdout=StringIO())
+        self.assertIsNotNone(get_cache().get(snapshot_key(quiz.pk, snapshot.version)))
+
+    def test_skips_unpublished_quiz(self):
+        quiz = create_quiz("Unpublished")
+        stderr = StringIO()
+        call_command("warm_quiz", quiz.pk, stdout=StringIO(), stderr=stderr)
+        self.assertIn("no published snapshot", stderr.getvalue())
+
+    def test_publishes_quizzes_opening_soon(self):
+        """
+        This test ensures that --within selects quizzes by opens_at and that
+        --publish compiles a snapshot for them.
+        """
+        soon = create_quiz("Soon", timezone.now() + timedelta(minutes=10))
+        later = create_quiz("Later", timezone.now() + timedelta(days=1))
+        call_command("warm_quiz", within=30, publish=True, stdout=StringIO())
+        soon.refresh_from_db()
+        later.refresh_from_db()
+        self.assertEqual(soon.published_version, 1)
+        self.assertIsNone(later.published_version)
+        self.assertIsNotNone(get_cache().get(snapshot_key(soon.pk, 1)))
+
+
+class RegradeCommandTests(TestCase):
+    """Tests for ``manage.py regrade``."""
+
+    def setUp(self):
+        self.quiz = Quiz.objects.create(title="Regrade", description="Desc", pass_mark=50)
+        self.question = Question.objects.create(content="question")
+        self.question.quiz.add(self.quiz)
+        self.right = Answer.objects.create(
+            question=self.question, content="right", correct=True)
+        self.wrong = Answer.objects.create(question=self.question, content="wrong")
+        for answer, correct in ((self.right, 1), (self.wrong, 0), (self.wrong, 0)):
+            Submission.objects.create(
+                quiz=self.quiz, guesses={str(self.question.pk): str(answer.pk)},
+                correct=correct, total=1, passed=bool(correct))
+        QuizStats.objects.create(quiz=self.quiz, attempts=3, passes=1, correct=1)
+        ScoreBucket.objects.create(quiz=self.quiz, bucket=100, count=1)
+        ScoreBucket.objects.create(quiz=self.quiz, bucket=0, count=2)
+        Answer.objects.filter(pk=self.right.pk).update(correct=False)
+        Answer.objects.filter(pk=self.wrong.pk).update(correct=True)
+
+    def test_regrade_applies_corrected_key(self):
+        """
+        This test ensures that submissions are regraded in chunks and the rollups are
+        adjusted by the difference.
+        """
+        call_command("regrade", self.quiz.pk, chunk_size=2, stdout=StringIO())
+        self.assertEqual(
+            list(Submission.objects.order_by("id").values_list("correct", flat=True)),
+            [0, 1, 1])
+        stats = QuizStats.objects.get(quiz=self.quiz)
+        self.assertEqual((stats.attempts, stats.passes, stats.correct), (3, 2, 2))
+        self.assertEqual(
+            dict(self.quiz.score_buckets.values_list("bucket", "count")),
+            {0: 1, 100: 2})
+        self.assertFalse(RegradeCheckpoint.objects.exists())
+
+    def test_regrade_leaves_adaptive_submissions_out_of_rollups(self):
+        """
+        This test ensures that adaptive submissions are regraded but do not move
+        the fixed-form statistics or score histogram.
+        """
+        adaptive = Submission.objects.create(
+            quiz=self.quiz, guesses={str(self.question.pk): str(self.wrong.pk)},
+            correct=0, total=1, mode=Submission.ADAPTIVE)
+        call_command("regrade", self.quiz.pk, stdout=StringIO())
+        self.assertEqual(Submission.objects.get(pk=adaptive.pk).correct, 1)
+        stats = QuizStats.objects.get(quiz=self.quiz)
+        self.assertEqual((stats.attempts, stats.passes, stats.correct), (3, 2, 2))
+        self.assertEqual(
+            dict(self.quiz.score_buckets.values_list("bucket", "count")),
+            {0: 1, 100: 2})
+
+    def test_regrade_with_worker_processes(self):
+        """
+        This test ensures that grading in a process pool gives the same result as
+        grading in the command's process.
+        """
+        call_command("regrade", self.quiz.pk, chunk_size=2, workers=2, stdout=StringIO())
+        self.assertEqual(
+            list(Submission.objects.order_by("id").values_list("correct", flat=True)),
+            [0, 1, 1])
+        stats = QuizStats.objects.get(quiz=self.quiz)
+        self.assertEqual((stats.passes, stats.correct), (2, 2))
+
+    def test_regrade_resumes_from_checkpoint(self):
+        """
+        This test ensures that a run with the same answer key skips submissions
+        before the checkpoint.
+        """
+        first = Submission.objects.order_by("id").first()
+        call_command("regrade", self.quiz.pk, chunk_size=1, stdout=StringIO())
+        Submission.objects.filter(pk=first.pk).update(correct=1)
+        RegradeCheckpoint.objects.create(
+            quiz=self.quiz, last_id=first.pk,
+            answer_key=key_digest(answer_key(self.quiz)))
+        stdout = StringIO()
+        call_command("regrade", self.quiz.pk, stdout=stdout)
+        self.assertIn("Resuming", stdout.getvalue())
+        self.assertEqual(Submission.objects.get(pk=first.pk).correct, 1)
+
+    def test_unknown_quiz(self):
+        with self.assertRaises(CommandError):
+            call_command("regrade", 999)
+
+
+class VersionedRegradeCommandTests(TestCase):
+    """Tests for regrading submissions taken on a published snapshot."""
+
+    def setUp(self):
+        get_cache().clear()
+        self.quiz = Quiz.objects.create(title="Versioned", description="Desc", pass_mark=50)
+        self.questions = []
+        for i in range(2):
+            question = Question.objects.create(content="question {}".format(i))
+            question.quiz.add(self.quiz)
+            right = Answer.objects.create(question=question, content="right", correct=True)
+            wrong = Answer.objects.create(question=question, content="wrong")
+            self.questions.append((question, right, wrong))
+        publish_quiz(self.quiz)
+        (first, right, wrong), (second, other_right, _) = self.questions
+        self.guesses = {str(first.pk): str(wrong.pk), str(second.pk): str(other_right.pk)}
+        self.submission = Submission.objects.create(
+            quiz=self.quiz, version=1, attempt="a", guesses=self.guesses,
+            correct=1, total=2, passed=True)
+        QuizStats.objects.create(quiz=self.quiz, attempts=1, passes=1, correct=1)
+        ScoreBucket.objects.create(quiz=self.quiz, bucket=50, count=1)
+
+    def correct_first_question(self):
+        _, right, wrong = self.questions[0]
+        Answer.objects.filter(pk=right.pk).update(correct=False)
+        Answer.objects.filter(pk=wrong.pk).update(correct=True)
+
+    def test_removed_questions_keep_credit(self):
+        """
+        This test ensures that a question removed from the quiz after the attempt
+        is still graded with the snapshot's answer.
+        """
+        self.correct_first_question()
+        self.questions[1][0].quiz.remove(self.quiz)
+        call_command("regrade", self.quiz.pk, stdout=StringIO())
+        self.submission.refresh_from_db()
+        self.assertEqual(self.submission.correct, 2)
+
+    def test_uses_pass_mark_of_version(self):
+        Quiz.objects.filter(pk=self.quiz.pk).update(pass_mark=100)
+        self.correct_first_question()
+        Answer.objects.filter(pk=self.questions[1][1].pk).update(correct=False)
+        Answer.objects.filter(pk=self.questions[1][2].pk).update(correct=True)
+        call_command("regrade", self.quiz.pk, stdout=StringIO())
+        self.submission.refresh_from_db()
+        self.assertEqual(self.submission.correct, 1)
+        self.assertIs(self.submission.passed, True)
+
+    def test_cached_result_is_invalidated(self):
+        """
+        This test ensures that the cached results page of a regraded submission is
+        removed so the student sees the new score.
+        """
+        key = result_key(self.quiz.pk, 1, self.guesses, "a")
+        get_cache().set(key, "stale page")
+        self.correct_first_question()
+        call_command("regrade", self.quiz.pk, stdout=StringIO())
+        self.assertIsNone(get_cache().get(key))
+
+
+class ImportTimeCommandTests(SimpleTestCase):
+    """Tests for ``manage.py importtime``."""
+
+    def test_parse_importtime(self):
+        report = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   slugify.special\n"
+            "import time:       300 |        420 | slugify\n"
+        )
+        self.assertEqual(parse_importtime(report), [
+            ("slugify.special", 120, 120, 1),
+            ("slugify", 300, 420, 0),
+        ])
+
+    def test_report(self):
+        stdout = StringIO()
+        call_command("importtime", "MCQuizApp.urls", limit=3, stdout=stdout)
+        self.assertIn("django", stdout.getvalue())
+        self.assertIn("module(s) in", stdout.getvalue())
+
+    def test_forbid(self):
+        """
+        This test ensures that --forbid fails when the module is imported at
+        startup and passes for the lazily imported rendering stack.
+        """
+        call_command(
+            "importtime", "MCQuizApp.urls", forbid=["slugify", "latexify.templatetags"],
+            stdout=StringIO())
+        with self.assertRaisesMessage(CommandError, "MCQuizApp.views"):
+            call_command("importtime", "MCQuizApp.urls", forbid=["MCQuizApp"],
+                         stdout=StringIO())
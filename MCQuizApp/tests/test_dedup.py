@@ -0,0 +1,92 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from ..dedup import (
+    find_clusters, fingerprint, link_candidates, make_masks, merge_questions,
+    shingle_hashes, signature, similarity)
+from ..models import Quiz, Question, Answer, Submission
+
+
+def create_question(content, answers, quiz=None):
+    question = Question.objects.create(content=content)
+    for index, text in enumerate(answers):
+        Answer.objects.create(question=question, content=text, correct=index == 0)
+    if quiz is not None:
+        question.quiz.add(quiz)
+    return question
+
+
+class SignatureTests(SimpleTestCase):
+    """Tests for the MinHash helpers in :mod:`MCQuizApp.dedup`."""
+
+    def sig(self, content, answers):
+        return signature(shingle_hashes(fingerprint(content, answers)), make_masks(64))
+
+    def test_fingerprint_ignores_case_punctuation_and_answer_order(self):
+        self.assertEqual(
+            fingerprint("What is 2 + 2?", ["Four", "Five"]),
+            fingerprint("what is 2+2", ["five", "four"]),
+        )
+
+    def test_similar_texts_have_similar_signatures(self):
+        base = self.sig("Which planet is closest to the sun in our solar system?",
+                        ["Mercury", "Venus"])
+        edited = self.sig("Which planet is the closest to the sun in our solar system?",
+                          ["Mercury", "Venus"])
+        other = self.sig("Name the largest ocean on Earth.", ["Pacific", "Atlantic"])
+        self.assertGreater(similarity(base, edited), 0.7)
+        self.assertLess(similarity(base, other), 0.3)
+
+    def test_link_candidates_compares_every_pair_in_a_group(self):
+        """
+        This test ensures that a dissimilar first member of a bucket does not
+        hide a similar pair behind it.
+        """
+        similar = lambda left, right: {left, right} == {1, 2}
+        self.assertEqual(link_candidates(3, [[0, 1, 2]], similar), [[1, 2]])
+
+
+class DuplicateDetectionTests(TestCase):
+    """Tests for :func:`~MCQuizApp.dedup.find_clusters` and merging."""
+
+    def setUp(self):
+        self.quiz = Quiz.objects.create(title="Planets", description="Desc")
+        self.other_quiz = Quiz.objects.create(title="Space", description="Desc")
+        self.original = create_question(
+            "Which planet is closest to the sun in our solar system?",
+            ["Mercury", "Venus"], self.quiz)
+        self.copy = create_question(
+            "Which planet is closest to the Sun in our solar system",
+            ["Mercury", "Venus"], self.other_quiz)
+        self.unrelated = create_question(
+            "Name the largest ocean on Earth.", ["Pacific", "Atlantic"], self.quiz)
+
+    def test_find_clusters(self):
+        self.assertEqual(find_clusters(), [[self.original.pk, self.copy.pk]])
+
+    def test_merge_repoints_quizzes_and_submissions(self):
+        """
+        This test ensures that merging moves quiz memberships and stored guesses
+        to the canonical question and deletes the duplicate.
+        """
+        copy_answer = self.copy.answer_set.get(content="Mercury")
+        original_answer = self.original.answer_set.get(content="Mercury")
+        submission = Submission.objects.create(
+            quiz=self.other_quiz, guesses={str(self.copy.pk): str(copy_answer.pk)},
+            correct=1, total=1, passed=True)
+        affected = merge_questions(self.original, [self.copy])
+        self.assertEqual(affected, [self.other_quiz.pk])
+        self.assertFalse(Question.objects.filter(pk=self.copy.pk).exists())
+        self.assertQuerySetEqual(self.other_quiz.question_set.all(), [self.original])
+        submission.refresh_from_db()
+        self.assertEqual(
+            submission.guesses, {str(self.original.pk): str(original_answer.pk)})
+        self.other_quiz.refresh_from_db()
+        self.assertEqual(self.other_quiz.number_of_questions, 1)
+
+    def test_command_merges_clusters(self):
+        stdout = StringIO()
+        call_command("find_duplicates", merge=True, stdout=stdout)
+        self.assertIn("Found 1 cluster(s)", stdout.getvalue())
+        self.assertEqual(Question.objects.count(), 2)
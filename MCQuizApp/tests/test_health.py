@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+STARTUP_PROBE = """
+import sys
+import django
+django.setup()
+from django.test import RequestFactory
+from django.urls import resolve
+match = resolve("/quiz/healthz")
+assert match.func(RequestFactory().get("/quiz/healthz")).status_code == 200
+print(",".join(sorted(
+    module for module in sys.modules
+    if module == "slugify" or module.startswith("latexify.templatetags"))))
+"""
+
+
+class HealthViewTests(TestCase):
+    def test_healthz(self):
+        response = self.client.get(reverse("mcquiz:healthz"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "ok"})
+
+    def test_readyz_checks_database(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("mcquiz:readyz"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "ok"})
+
+
+class LazyStartupTests(SimpleTestCase):
+    def test_health_probe_does_not_import_rendering(self):
+        """
+        This test ensures that starting Django and answering a health probe in
+        a fresh interpreter imports neither latexify's template tags nor
+        python-slugify.
+        """
+        result = subprocess.run(
+            [sys.executable, "-c", STARTUP_PROBE],
+            capture_output=True, text=True, cwd=settings.BASE_DIR,
+            env={"DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE,
+                 "PATH": "", "PYTHONPATH": os.pathsep.join(sys.path)},
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "")
@@ -0,0 +1,61 @@
+from django.test import TestCase
+from ..leaderboard import Distribution, bucket_for, move_scores, record_score
+from ..models import Quiz, ScoreBucket
+
+
+class LeaderboardTests(TestCase):
+    """Tests for :mod:`MCQuizApp.leaderboard`."""
+
+    def setUp(self):
+        self.quiz = Quiz.objects.create(title="Scores", description="Desc")
+        for correct in (1, 2, 2, 3, 4):
+            record_score(self.quiz.pk, correct, 4)
+
+    def test_bucket_for(self):
+        self.assertEqual(bucket_for(2, 3), 66)
+        self.assertEqual(bucket_for(0, 0), 0)
+
+    def test_record_score_builds_histogram(self):
+        self.assertEqual(
+            dict(self.quiz.score_buckets.values_list("bucket", "count")),
+            {25: 1, 50: 2, 75: 1, 100: 1})
+
+    def test_percentile(self):
+        """
+        This test ensures that the percentile counts lower scores and half of equal scores.
+        """
+        distribution = Distribution(self.quiz.pk)
+        self.assertEqual(distribution.percentile(2, 4), 40)
+        self.assertEqual(distribution.percentile(4, 4), 90)
+        self.assertEqual(distribution.percentile(0, 4), 0)
+
+    def test_percentile_uses_stored_bucket(self):
+        """
+        This test ensures that the percentile looks up the bucket the score was
+        stored in, including scores whose percentage is not exact in floating
+        point (29/50 * 100 is 57.99999999999999).
+        """
+        for correct, total in ((29, 50), (29, 100), (57, 100), (58, 100)):
+            quiz = Quiz.objects.create(title="Exact", description="Desc")
+            record_score(quiz.pk, correct, total)
+            self.assertEqual(Distribution(quiz.pk).percentile(correct, total), 50)
+
+    def test_percentile_without_attempts(self):
+        other = Quiz.objects.create(title="Empty", description="Desc")
+        self.assertIsNone(Distribution(other.pk).percentile(2, 4))
+
+    def test_top_scores(self):
+        self.assertEqual(Distribution(self.quiz.pk).top(3), [100, 75, 50])
+        self.assertEqual(Distribution(self.quiz.pk).top(10), [100, 75, 50, 50, 25])
+
+    def test_lookup_is_one_query(self):
+        with self.assertNumQueries(1):
+            distribution = Distribution(self.quiz.pk)
+            distribution.percentile(3, 4)
+            distribution.top()
+
+    def test_move_scores(self):
+        move_scores(self.quiz.pk, [(1, 4, 4)])
+        self.assertFalse(
+            ScoreBucket.objects.filter(quiz=self.quiz, bucket=25, count__gt=0).exists())
+        self.assertEqual(Distribution(self.quiz.pk).top(2), [100, 100])
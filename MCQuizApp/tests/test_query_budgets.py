@@ -0,0 +1,91 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from ..cache import get_cache
+from ..models import Question, Quiz
+from ..readmodel import get_published_view
+from ..snapshots import publish_quiz
+from .budget import correct_guesses, make_quiz, query_budget
+
+SIZES = (1, 10, 100)
+SECONDS = 1.0
+
+
+def attempt(token):
+    return lambda quiz: dict(correct_guesses(quiz), attempt=token)
+
+
+@override_settings(MCQUIZ_RATE_LIMIT=None)
+class QueryBudgetTests(TestCase):
+    """
+    This class checks that every view in MCQuizApp/urls.py runs a fixed number of
+    queries, whatever the size of the quiz, and renders within a time budget.
+    """
+
+    def setUp(self):
+        get_cache().clear()
+        get_published_view.cache_clear()
+
+    def assertBudget(self, name, queries, published=False, params=None, warm=None):
+        for size in SIZES:
+            with self.subTest(size=size):
+                quiz = make_quiz(size, title="Budget Quiz {}".format(size))
+                if published:
+                    publish_quiz(quiz)
+                args = () if name in ("index", "search") else (quiz.pk, quiz.url)
+                url = reverse("mcquiz:{}".format(name), args=args)
+                data = params(quiz) if callable(params) else params
+                if warm:
+                    self.client.get(url, warm(quiz) if callable(warm) else data)
+                with query_budget(queries, SECONDS):
+                    response = self.client.get(url, data)
+                self.assertEqual(response.status_code, 200)
+
+    def test_index(self):
+        self.assertBudget("index", 1)
+
+    def test_quiz_detail(self):
+        self.assertBudget("quiz-detail", 1)
+
+    def test_question_list(self):
+        """Unpublished quizzes: quiz, questions and prefetched answers."""
+        self.assertBudget("question-list", 3)
+
+    def test_question_list_published(self):
+        """Published quizzes: quiz and snapshot, then only the quiz once cached."""
+        self.assertBudget("question-list", 2, published=True)
+        self.assertBudget("question-list", 1, published=True, warm=True)
+
+    def test_solutions(self):
+        """
+        Grading an unpublished quiz compiles it (3 queries) and records the
+        submission: insert, statistics, histogram bucket and distribution.
+        """
+        self.assertBudget(
+            "solutions", 3 + 4, params=attempt("b"), warm=attempt("a"))
+
+    def test_solutions_published(self):
+        self.assertBudget(
+            "solutions", 2 + 4, published=True, params=attempt("b"), warm=attempt("a"))
+
+    def test_solutions_repeated_submission(self):
+        """A repeated submission is served from the result cache."""
+        self.assertBudget(
+            "solutions", 1, published=True, params=attempt("a"), warm=True)
+
+    def test_search(self):
+        self.assertBudget("search", 1, params={"q": "budget"})
+
+    def test_adaptive(self):
+        self.assertBudget("adaptive", 6, published=True, warm=True)
+
+
+class QueryBudgetHarnessTests(TestCase):
+    def test_over_budget_lists_queries(self):
+        """
+        This test ensures that exceeding the budget fails with the captured SQL.
+        """
+        make_quiz(1)
+        with self.assertRaisesMessage(AssertionError, "2 queries executed, budget is 1"):
+            with query_budget(1):
+                list(Quiz.objects.all())
+                list(Question.objects.all())
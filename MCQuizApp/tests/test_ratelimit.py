@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from ..cache import get_cache
+from ..models import Quiz, Question, Answer, RateLimitBucket
+from ..ratelimit import CacheBackend, DatabaseBackend, LocMemBackend, refill
+
+
+class RefillTests(TestCase):
+    """Tests for :func:`~MCQuizApp.ratelimit.refill`."""
+
+    def test_consumes_a_token(self):
+        self.assertEqual(refill(5, 0, 0, 1, 10), (True, 4))
+
+    def test_empty_bucket_is_rejected(self):
+        self.assertEqual(refill(0.5, 0, 0, 1, 10), (False, 0.5))
+
+    def test_refill_is_capped_at_capacity(self):
+        self.assertEqual(refill(0, 0, 100, 1, 10), (True, 9))
+
+
+class BackendTests(TestCase):
+    """Each backend allows a burst of ``capacity`` requests then rejects."""
+
+    def assertBurst(self, backend):
+        results = [backend.consume("client", 0.001, 3) for _ in range(4)]
+        self.assertEqual(results, [True, True, True, False])
+
+    def test_locmem_backend(self):
+        self.assertBurst(LocMemBackend())
+
+    def test_cache_backend(self):
+        get_cache().clear()
+        self.assertBurst(CacheBackend())
+
+    def test_database_backend(self):
+        self.assertBurst(DatabaseBackend())
+        self.assertEqual(RateLimitBucket.objects.get(key="client").tokens // 1, 0)
+
+
+@override_settings(MCQUIZ_RATE_LIMIT={
+    "BACKEND": "MCQuizApp.ratelimit.DatabaseBackend", "RATE": 0.001, "CAPACITY": 2})
+class RateLimitedViewTests(TestCase):
+
+    def setUp(self):
+        quiz = Quiz.objects.create(title="Limited", description="Desc")
+        question = Question.objects.create(content="question")
+        question.quiz.add(quiz)
+        Answer.objects.create(question=question, content="answer", correct=True)
+        self.url = reverse("mcquiz:solutions", args=(quiz.pk, quiz.url))
+
+    def test_solutions_returns_429_when_limited(self):
+        statuses = [self.client.get(self.url).status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 429])
+
+    @override_settings(MCQUIZ_RATE_LIMIT={
+        "BACKEND": "MCQuizApp.ratelimit.DatabaseBackend", "RATE": 0.001, "CAPACITY": 2,
+        "KEY": "MCQuizApp.ratelimit.forwarded_client_key"})
+    def test_configured_client_key(self):
+        """
+        This test ensures that clients behind one proxy address get separate
+        buckets when the key function reads the forwarded address.
+        """
+        statuses = [
+            self.client.get(self.url, HTTP_X_FORWARDED_FOR="10.0.0.{}".format(i % 3))
+            .status_code for i in range(6)]
+        self.assertEqual(statuses, [200] * 6)
+        statuses = [
+            self.client.get(self.url, HTTP_X_FORWARDED_FOR="spoofed, 10.0.0.1")
+            .status_code for _ in range(2)]
+        self.assertEqual(statuses, [429, 429])
+
+    @override_settings()
+    def test_rate_limit_is_off_by_default(self):
+        del settings.MCQUIZ_RATE_LIMIT
+        statuses = {self.client.get(self.url).status_code for _ in range(3)}
+        self.assertEqual(statuses, {200})
+
+    @override_settings(MCQUIZ_RATE_LIMIT=None)
+    def test_rate_limit_can_be_disabled(self):
+        statuses = {self.client.get(self.url).status_code for _ in range(3)}
+        self.assertEqual(statuses, {200})
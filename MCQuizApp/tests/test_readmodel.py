@@ -0,0 +1,46 @@
+from django.test import TestCase
+from ..cache import get_cache
+from ..models import Quiz, Question, Answer
+from ..readmodel import QuizView, get_published_view, get_quiz_view
+from ..snapshots import publish_quiz
+
+
+class ReadModelTests(TestCase):
+    """Tests for :mod:`MCQuizApp.readmodel`."""
+
+    def setUp(self):
+        get_cache().clear()
+        get_published_view.cache_clear()
+        self.quiz = Quiz.objects.create(title="Read Model Quiz", description="Desc")
+        self.question = Question.objects.create(content="question 1")
+        self.question.quiz.add(self.quiz)
+        self.answer = Answer.objects.create(
+            question=self.question, content="answer 1", correct=True)
+
+    def test_views_use_slots(self):
+        """
+        This test ensures that the read model objects do not carry a per-instance __dict__.
+        """
+        view = get_quiz_view(self.quiz.pk)
+        self.assertIsInstance(view, QuizView)
+        for obj in (view, view.questions[0], view.questions[0].answers[0]):
+            self.assertFalse(hasattr(obj, "__dict__"))
+        self.assertEqual(view.questions[0].answer, str(self.answer.pk))
+
+    def test_published_view_is_shared(self):
+        """
+        This test ensures that a published quiz is built once and then served from
+        the per-process cache with a single query.
+        """
+        publish_quiz(self.quiz)
+        first = get_quiz_view(self.quiz.pk)
+        with self.assertNumQueries(1):
+            second = get_quiz_view(self.quiz.pk)
+        self.assertIs(first, second)
+
+    def test_new_version_replaces_cached_view(self):
+        publish_quiz(self.quiz)
+        first = get_quiz_view(self.quiz.pk)
+        publish_quiz(self.quiz)
+        second = get_quiz_view(self.quiz.pk)
+        self.assertEqual((first.version, second.version), (1, 2))
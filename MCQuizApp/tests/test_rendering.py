@@ -0,0 +1,45 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils.text import slugify as django_slugify
+from ..models import Quiz, Question, Answer
+from ..rendering import SLUGIFY_FALLBACK, load, render_latex, slugify
+from ..snapshots import compile_quiz
+
+
+def shout(text):
+    return text.upper()
+
+
+class RenderingTests(SimpleTestCase):
+    def test_default_renderer_uses_latexify(self):
+        self.assertIn("django-latexify", render_latex("$x$"))
+
+    @override_settings(MCQUIZ_LATEX_RENDERER="MCQuizApp.tests.test_rendering.shout")
+    def test_configured_renderer(self):
+        self.assertEqual(render_latex("x + y"), "X + Y")
+
+    def test_default_slugify_transliterates(self):
+        self.assertEqual(slugify("Straße Quiz"), "strasse-quiz")
+
+    @override_settings(MCQUIZ_SLUGIFY="django.utils.text.slugify")
+    def test_configured_slugify(self):
+        self.assertEqual(slugify("Straße Quiz"), "strae-quiz")
+
+    def test_load_falls_back_when_missing(self):
+        """
+        This test ensures that a missing default implementation falls back to
+        the given alternative instead of failing.
+        """
+        self.assertIs(load("not_installed.slugify", SLUGIFY_FALLBACK), django_slugify)
+        with self.assertRaises(ImportError):
+            load("not_installed.slugify")
+
+
+@override_settings(MCQUIZ_LATEX_RENDERER="MCQuizApp.tests.test_rendering.shout")
+class ConfiguredRendererSnapshotTests(TestCase):
+    def test_compile_uses_configured_renderer(self):
+        quiz = Quiz.objects.create(title="Render Quiz", description="Desc")
+        question = Question.objects.create(content="what is x?")
+        question.quiz.add(quiz)
+        Answer.objects.create(question=question, content="y", correct=True)
+        payload = compile_quiz(quiz)
+        self.assertIn("WHAT IS X?", str(payload))
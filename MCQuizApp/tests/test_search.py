@@ -0,0 +1,114 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from ..models import Quiz, Question, Answer, SearchEntry
+from ..search import filter_queryset
+
+
+class SearchIndexTests(TestCase):
+    """Tests for :mod:`MCQuizApp.search` and the signals that keep it updated."""
+
+    def setUp(self):
+        self.quiz = Quiz.objects.create(title="Calculus Basics", description="Limits")
+        self.question = Question.objects.create(
+            content="Evaluate the integral", reason="Use substitution")
+        self.question.quiz.add(self.quiz)
+        Answer.objects.create(question=self.question, content="Logarithm", correct=True)
+
+    def search(self, model, kind, query):
+        return list(filter_queryset(model.objects.all(), kind, query))
+
+    def test_question_fields_are_indexed(self):
+        """
+        This test ensures that question content, explanation and answers are searchable.
+        """
+        for query in ("integral", "substitution", "logarithm"):
+            self.assertEqual(
+                self.search(Question, SearchEntry.QUESTION, query), [self.question])
+
+    def test_prefix_match(self):
+        self.assertEqual(self.search(Quiz, SearchEntry.QUIZ, "calc"), [self.quiz])
+
+    def test_index_updates_on_save(self):
+        self.question.content = "Differentiate the polynomial"
+        self.question.save()
+        self.assertEqual(self.search(Question, SearchEntry.QUESTION, "integral"), [])
+        self.assertEqual(
+            self.search(Question, SearchEntry.QUESTION, "polynomial"), [self.question])
+
+    def test_index_updates_on_delete(self):
+        self.question.delete()
+        self.assertFalse(
+            SearchEntry.objects.filter(kind=SearchEntry.QUESTION).exists())
+
+    def test_empty_query_matches_nothing(self):
+        self.assertEqual(self.search(Quiz, SearchEntry.QUIZ, "  ?! "), [])
+
+    def test_rebuild_command(self):
+        SearchEntry.objects.all().delete()
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual(
+            self.search(Question, SearchEntry.QUESTION, "integral"), [self.question])
+        self.assertEqual(
+            self.search(Question, SearchEntry.QUESTION, "logarithm"), [self.question])
+
+    def test_rebuild_command_query_count_is_constant(self):
+        """
+        This test ensures that rebuilding the index does not query answers once
+        per question.
+        """
+        def rebuild_queries():
+            with CaptureQueriesContext(connection) as context:
+                call_command("rebuild_search_index", stdout=StringIO())
+            return len(context)
+
+        before = rebuild_queries()
+        for i in range(10):
+            question = Question.objects.create(content="Question {}".format(i))
+            Answer.objects.create(question=question, content="Answer {}".format(i))
+        self.assertEqual(rebuild_queries(), before)
+        self.assertEqual(
+            self.search(Question, SearchEntry.QUESTION, "answer"),
+            list(Question.objects.exclude(pk=self.question.pk).order_by("pk")))
+
+
+class SearchViewTests(TestCase):
+    """
+    This deals with all tests related to the search_view function in views.py.
+    name='search'
+    """
+
+    def setUp(self):
+        self.quiz = Quiz.objects.create(title="Calculus Basics", description="Limits")
+        question = Question.objects.create(content="Evaluate the integral")
+        question.quiz.add(self.quiz)
+        Answer.objects.create(question=question, content="Logarithm", correct=True)
+        self.quiz.save()
+        self.draft = Quiz.objects.create(
+            title="Calculus Draft", description="Hidden", draft=True)
+
+    def test_finds_quiz_by_question_text(self):
+        response = self.client.get(reverse("mcquiz:search"), {"q": "integral"})
+        self.assertEqual(response.status_code, 200)
+        self.assertQuerySetEqual(response.context["quizzes"], [self.quiz])
+
+    def test_hides_draft_quizzes(self):
+        response = self.client.get(reverse("mcquiz:search"), {"q": "calculus"})
+        self.assertQuerySetEqual(response.context["quizzes"], [self.quiz])
+
+    def test_no_results(self):
+        response = self.client.get(reverse("mcquiz:search"), {"q": "geometry"})
+        self.assertContains(response, "No quizzes found.")
+
+    def test_admin_search_uses_index(self):
+        user = get_user_model().objects.create_superuser(
+            "admin", "admin@example.com", "password")
+        self.client.force_login(user)
+        response = self.client.get(
+            reverse("admin:MCQuizApp_question_changelist"), {"q": "integ"})
+        self.assertContains(response, "Evaluate the integral")
@@ -0,0 +1,132 @@
+from django.test import TestCase
+from django.urls import reverse
+from ..cache import get_cache
+from ..models import Quiz, Question, Answer
+from ..readmodel import get_published_view, get_quiz_view
+from ..snapshots import compile_quiz, load_snapshot, publish_quiz
+from ..submissions import sign_version
+
+
+class SnapshotTests(TestCase):
+    """Tests for :mod:`MCQuizApp.snapshots`."""
+
+    def setUp(self):
+        get_cache().clear()
+        get_published_view.cache_clear()
+        self.quiz = Quiz.objects.create(title="Snapshot Quiz", description="Desc")
+        self.question = Question.objects.create(content="Original question")
+        self.question.quiz.add(self.quiz)
+        self.wrong = Answer.objects.create(
+            question=self.question, content="Wrong answer")
+        self.right = Answer.objects.create(
+            question=self.question, content="Right answer", correct=True)
+        unanswered = Question.objects.create(content="Unanswered question")
+        unanswered.quiz.add(self.quiz)
+
+    def test_compile_includes_answer_key(self):
+        """
+        This test ensures that the compiled payload contains only answered questions
+        and records the correct answer.
+        """
+        payload = compile_quiz(self.quiz)
+        self.assertEqual(len(payload["questions"]), 1)
+        question = payload["questions"][0]
+        self.assertEqual(question["answer"], self.right.pk)
+        self.assertEqual(len(question["answers"]), 2)
+        self.assertIn("django-latexify", question["content"])
+
+    def test_compile_skips_questions_without_correct_answer(self):
+        """
+        This test ensures that a question with a stale hasAnswer flag but no
+        correct answer is not compiled, so a guess of "None" cannot match it.
+        """
+        Answer.objects.filter(pk=self.right.pk).update(correct=False)
+        self.assertEqual(compile_quiz(self.quiz)["questions"], [])
+        url = reverse("mcquiz:solutions", args=(self.quiz.pk, self.quiz.url))
+        response = self.client.get(url, {str(self.question.pk): "None"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_publish_increments_version(self):
+        first = publish_quiz(self.quiz)
+        second = publish_quiz(self.quiz)
+        self.assertEqual((first.version, second.version), (1, 2))
+        self.quiz.refresh_from_db()
+        self.assertEqual(self.quiz.published_version, 2)
+
+    def test_edits_do_not_change_published_snapshot(self):
+        """
+        This test ensures that editing a question after publishing does not change
+        what students see until the quiz is published again.
+        """
+        publish_quiz(self.quiz)
+        self.question.content = "Edited question"
+        self.question.save()
+        url = reverse("mcquiz:question-list", args=(self.quiz.pk, self.quiz.url))
+        response = self.client.get(url)
+        self.assertContains(response, "Original question")
+        self.assertNotContains(response, "Edited question")
+
+        publish_quiz(self.quiz)
+        response = self.client.get(url)
+        self.assertContains(response, "Edited question")
+
+    def test_load_published_quiz_is_one_query(self):
+        """
+        This test ensures that the snapshot blob is read once and then served from
+        the cache, and that a cached quiz view costs only the quiz lookup.
+        """
+        publish_quiz(self.quiz)
+        with self.assertNumQueries(1):
+            load_snapshot(self.quiz.pk, 1)
+        with self.assertNumQueries(0):
+            load_snapshot(self.quiz.pk, 1)
+        get_quiz_view(self.quiz.pk)
+        with self.assertNumQueries(1):
+            get_quiz_view(self.quiz.pk)
+
+    def test_grading_uses_snapshot_answer_key(self):
+        """
+        This test ensures that changing the correct answer does not regrade against
+        the live tables while a snapshot is published.
+        """
+        publish_quiz(self.quiz)
+        Answer.objects.filter(pk=self.right.pk).update(correct=False)
+        Answer.objects.filter(pk=self.wrong.pk).update(correct=True)
+        url = reverse("mcquiz:solutions", args=(self.quiz.pk, self.quiz.url))
+        response = self.client.get(url, {str(self.question.pk): str(self.right.pk)})
+        self.assertEqual(response.context["total"], 1)
+
+    def test_attempt_is_graded_against_version_shown(self):
+        """
+        This test ensures that republishing mid-attempt does not change the answer
+        key for students who were shown the earlier version.
+        """
+        publish_quiz(self.quiz)
+        response = self.client.get(
+            reverse("mcquiz:question-list", args=(self.quiz.pk, self.quiz.url)))
+        attempt, version = response.context["attempt"], response.context["version"]
+        self.assertContains(response, 'name="version" value="{}"'.format(version))
+        Answer.objects.filter(pk=self.right.pk).update(correct=False)
+        Answer.objects.filter(pk=self.wrong.pk).update(correct=True)
+        publish_quiz(self.quiz)
+        url = reverse("mcquiz:solutions", args=(self.quiz.pk, self.quiz.url))
+        guesses = {str(self.question.pk): str(self.right.pk)}
+        response = self.client.get(url, dict(guesses, attempt=attempt, version=version))
+        self.assertEqual(response.context["total"], 1)
+
+    def test_client_cannot_choose_version(self):
+        """
+        This test ensures that an unsigned version, or a token issued for another
+        attempt, is ignored and the published version is used.
+        """
+        publish_quiz(self.quiz)
+        version = sign_version("other", 1)
+        Answer.objects.filter(pk=self.right.pk).update(correct=False)
+        Answer.objects.filter(pk=self.wrong.pk).update(correct=True)
+        publish_quiz(self.quiz)
+        url = reverse("mcquiz:solutions", args=(self.quiz.pk, self.quiz.url))
+        guesses = {str(self.question.pk): str(self.right.pk)}
+        for params in ({"attempt": "a", "version": "1"},
+                       {"attempt": "b", "version": version}):
+            response = self.client.get(url, dict(guesses, **params))
+            self.assertEqual(response.context["total"], 0)
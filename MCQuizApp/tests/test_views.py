@@ -1,6 +1,12 @@
+from datetime import timedelta
+
 from django.urls import reverse
 from django.test import TestCase
-from ..models import Quiz, Question, Answer
+from django.utils import timezone
+from ..cache import get_cache
+from ..models import Quiz, Question, Answer, QuizStats, Submission
+from ..readmodel import get_published_view
+from ..snapshots import publish_quiz
 
 
 def create_quiz(id, title, description, draft=False):
@@ -71,6 +77,22 @@ class QuizListViewTests(TestCase):
         self.assertQuerySetEqual(response.context['quizzes'], [])
 
 
+    def test_quiz_not_open_yet(self):
+        """
+        This test ensures that quizzes with an opening time in the future are not listed.
+        """
+        quiz = create_quiz(1, "Future Quiz", "Desc")
+        question = create_question(1, "Question", True)
+        question.quiz.add(quiz)
+        create_answer(1, question, "Ans", True)
+        quiz.opens_at = timezone.now() + timedelta(hours=1)
+        quiz.save()
+        response = self.client.get(reverse('mcquiz:index'))
+        self.assertNotContains(response, "Future Quiz")
+        url = reverse('mcquiz:question-list', args=(quiz.id, quiz.url))
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
 class QuizDetailViewTests(TestCase):
     """
     This deals with all tests related to the QuizDetailView class in views.py.
@@ -119,6 +141,27 @@ class QuizDetailViewTests(TestCase):
         self.assertContains(response, "Test Title 1")
         self.assertContains(response, "Test Description 1")
 
+    def test_cached_card_shows_edits(self):
+        """
+        This test ensures that the cached detail card of a published quiz shows
+        edits to the quiz without republishing it.
+        """
+        get_cache().clear()
+        quiz1 = create_quiz(1, "Test Title 1", "Test Description 1", False)
+        question1 = create_question(1, "Question 1")
+        question1.quiz.add(quiz1)
+        create_answer(1, question1, "Test Answer 1", True)
+        quiz1.draft = False
+        quiz1.save()
+        publish_quiz(quiz1)
+        url = reverse('mcquiz:quiz-detail', args=(quiz1.id, quiz1.url))
+        self.assertContains(self.client.get(url), "Test Description 1")
+        Quiz.objects.filter(pk=quiz1.pk).update(
+            description="Edited Description", pass_mark=70)
+        response = self.client.get(url)
+        self.assertContains(response, "Edited Description")
+        self.assertContains(response, "70")
+
 
 class Question_ViewTests(TestCase):
     """
@@ -146,11 +189,13 @@ class Question_ViewTests(TestCase):
                             "Test Description 1", draft=False)
         question1 = create_question(1, "Test Question 1", hasAnswer=False)
         question2 = create_question(2, "Test Question 2", hasAnswer=True)
+        create_answer(1, question2, "Test Answer 1", correct=True)
         question1.quiz.add(quiz1)
         question2.quiz.add(quiz1)
         url = reverse('mcquiz:question-list', args=(quiz1.id, quiz1.url))
         response = self.client.get(url)
         self.assertContains(response, "Test Question 2")
+        self.assertNotContains(response, "Test Question 1")
 
     def test_quiz_with_questions_answers(self):
         """
@@ -217,3 +262,82 @@ class SolutionsTests(TestCase):
         url = "/quiz/1/test-title-1/solutions?1=2"
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
+
+
+class SubmissionIdempotencyTests(TestCase):
+    """
+    This deals with reusing the result of repeated submissions in the solutions view.
+    """
+
+    def setUp(self):
+        get_cache().clear()
+        get_published_view.cache_clear()
+        self.quiz = create_quiz(1, "Test Title 1", "Test Description 1")
+        question = create_question(1, "Test Question 1")
+        create_answer(1, question, "Test Answer 1", correct=True)
+        create_answer(2, question, "Test Answer 2")
+        question.quiz.add(self.quiz)
+        publish_quiz(self.quiz)
+        self.url = reverse('mcquiz:solutions', args=(1, self.quiz.url))
+
+    def test_repeated_submission_is_not_regraded(self):
+        """
+        This test ensures that submitting the same guesses for the same attempt
+        returns the stored result without grading again.
+        """
+        first = self.client.get(self.url, {"1": "1", "attempt": "abc"})
+        self.assertEqual(first.context["total"], 1)
+        second = self.client.get(self.url, {"1": "1", "attempt": "abc", "x": "y"})
+        self.assertIsNone(second.context)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(Submission.objects.count(), 1)
+
+    def test_submission_is_recorded(self):
+        """
+        This test ensures that a graded submission is stored and counted in the quiz statistics.
+        """
+        self.client.get(self.url, {"1": "1", "attempt": "abc"})
+        submission = Submission.objects.get()
+        self.assertEqual(submission.guesses, {"1": "1"})
+        self.assertEqual((submission.correct, submission.total), (1, 1))
+        self.assertIs(submission.passed, True)
+        stats = QuizStats.objects.get(quiz=self.quiz)
+        self.assertEqual((stats.attempts, stats.passes, stats.correct), (1, 1, 1))
+
+    def test_percentile_is_shown(self):
+        """
+        This test ensures that the results page shows the percentile of the score
+        among all attempts.
+        """
+        self.client.get(self.url, {"1": "2", "attempt": "first"})
+        response = self.client.get(self.url, {"1": "1", "attempt": "second"})
+        self.assertEqual(response.context["percentile"], 75)
+        self.assertEqual(response.context["top_scores"], [100, 0])
+        self.assertContains(response, "Percentile")
+
+    def test_different_guesses_are_graded(self):
+        self.client.get(self.url, {"1": "1", "attempt": "abc"})
+        response = self.client.get(self.url, {"1": "2", "attempt": "abc"})
+        self.assertEqual(response.context["total"], 0)
+
+    def test_repeated_submission_of_unpublished_quiz_is_stored_once(self):
+        """
+        This test ensures that an unpublished quiz is regraded on every request
+        but a repeated submission is not stored or counted again.
+        """
+        quiz = create_quiz(2, "Test Title 2", "Test Description 2")
+        question = create_question(2, "Test Question 2")
+        create_answer(3, question, "Test Answer 3", correct=True)
+        question.quiz.add(quiz)
+        url = reverse('mcquiz:solutions', args=(2, quiz.url))
+        for _ in range(2):
+            response = self.client.get(url, {"2": "3", "attempt": "abc"})
+            self.assertEqual(response.context["total"], 1)
+        self.assertEqual(Submission.objects.filter(quiz=quiz).count(), 1)
+        self.assertEqual(QuizStats.objects.get(quiz=quiz).attempts, 1)
+
+    def test_questions_view_issues_attempt_token(self):
+        url = reverse('mcquiz:question-list', args=(1, self.quiz.url))
+        response = self.client.get(url)
+        self.assertEqual(len(response.context["attempt"]), 32)
+        self.assertContains(response, 'name="attempt"')
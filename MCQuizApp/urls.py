@@ -1,13 +1,18 @@
 from django.urls import path, include
-from . import views
+from . import health, views
 
 app_name = 'mcquiz'
 urlpatterns = [
     path('', views.QuizListView.as_view(), name='index'),
+    path('search', views.search_view, name='search'),
+    path('healthz', health.healthz, name='healthz'),
+    path('readyz', health.readyz, name='readyz'),
     path('<int:pk>/<slug:quiz_url>',
          views.QuizDetailView.as_view(), name='quiz-detail'),
     path('<int:pk>/<slug:quiz_url>/questions',
          views.questions_view, name='question-list'),
     path('<int:pk>/<slug:quiz_url>/solutions',
          views.solutions, name='solutions'),
+    path('<int:pk>/<slug:quiz_url>/adaptive',
+         views.adaptive_view, name='adaptive'),
 ]
@@ -1,10 +1,23 @@
+import random
+import uuid
+
+from django.db.models import Q
 from django.http.response import Http404
 from django.views.generic.detail import DetailView
 from django.views.generic.list import ListView
-from django.shortcuts import get_object_or_404, render
-from django.http import Http404
+from django.shortcuts import get_object_or_404, redirect, render
+from django.http import Http404, HttpResponse
+from django.template.loader import render_to_string
 
-from .models import Quiz
+from .adaptive import estimate_ability, get_adaptive_length, get_item_index
+from .cache import get_cache, get_cache_alias, get_or_build, get_timeout
+from .leaderboard import Distribution
+from .models import Quiz, SearchEntry, Submission
+from .ratelimit import rate_limit
+from .readmodel import get_quiz_view
+from .search import matching_ids
+from .submissions import (
+    normalize_guesses, record_submission, sign_version, signed_version, submission_key)
 
 
 class QuizListView(ListView):
@@ -13,42 +26,96 @@ class QuizListView(ListView):
     **HTTP method:** ``GET``
 
     **Context:**
-        ``quizzes`` -- queryset of quizzes with at least one question.
+        ``quizzes`` -- queryset of open quizzes with at least one question.
 
     **Template:** ``MCQuizApp/quiz_list.html`` (via :class:`ListView`)
     """
 
     model = Quiz
     context_object_name = "quizzes"
-    queryset = Quiz.objects.filter(number_of_questions__gt=0).filter(draft=False)
+
+    def get_queryset(self):
+        return Quiz.objects.open().filter(number_of_questions__gt=0).filter(draft=False)
 
 
 class QuizDetailView(DetailView):
     """Show details for a single quiz.
 
+    The body of published quizzes is cached as a template fragment keyed
+    by the snapshot version and the quiz fields it shows, so edits appear
+    without republishing (see ``manage.py warm_quiz``).
+
     **HTTP method:** ``GET``
 
     **Context:**
         ``quiz`` -- quiz instance specified by ``pk``
+        ``fragment_timeout`` -- lifetime of the cached page fragment
+        ``fragment_cache`` -- cache alias used for the fragment
 
     **Template:** ``MCQuizApp/quiz_detail.html``
     """
 
     model = Quiz
+    template_name = "MCQuizApp/quiz_detail.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["fragment_timeout"] = get_timeout()
+        context["fragment_cache"] = get_cache_alias()
+        return context
 
     def get_object(self, *args, **kwargs):
         pk = self.kwargs.get("pk")
-        return get_object_or_404(Quiz, pk=pk, draft=False)
+        return get_object_or_404(Quiz.objects.open(), pk=pk, draft=False)
+
+
+def search_view(request):
+    """Search published quizzes by title, description or question text.
+
+    A quiz matches when its own text matches or when one of its questions
+    (content, explanation or answers) matches.
+
+    **HTTP method:** ``GET`` with the query in ``q``.
+
+    **Context:**
+        ``query`` -- the submitted query
+        ``quizzes`` -- up to 50 matching open, published quizzes
+
+    **Template:** ``MCQuizApp/search.html``
+    """
+
+    query = request.GET.get("q", "").strip()
+    quizzes = Quiz.objects.none()
+    if query:
+        quizzes = (
+            Quiz.objects.open()
+            .filter(draft=False, number_of_questions__gt=0)
+            .filter(
+                Q(pk__in=matching_ids(SearchEntry.QUIZ, query))
+                | Q(question__in=matching_ids(SearchEntry.QUESTION, query))
+            )
+            .distinct()
+            .order_by("title")[:50]
+        )
+    context = {"query": query, "quizzes": quizzes}
+    return render(request, "MCQuizApp/search.html", context)
 
 
 def questions_view(request, pk, quiz_url):
     """Display the questions for a quiz and accept answers.
 
+    Content is read from the quiz's published snapshot through the shared
+    :class:`~MCQuizApp.readmodel.QuizView`.
+
     **HTTP method:** ``GET``
 
     **Context:**
         ``title`` -- quiz title
-        ``questions`` -- list of dictionaries for each question
+        ``questions`` -- list of ``(question, answers)`` pairs with the
+        answers in random order
+        ``attempt`` -- token identifying this attempt at the quiz
+        ``version`` -- signed token binding the snapshot version shown to
+        the attempt, or ``None`` if the quiz is unpublished
         ``pk`` -- quiz primary key
         ``url`` -- quiz slug
 
@@ -56,78 +123,171 @@ def questions_view(request, pk, quiz_url):
     """
 
     template_name = "MCQuizApp/question_list.html"
-    data = []
     context = {}
-    quiz = get_object_or_404(Quiz, id=pk)
-    questions = quiz.get_questions()
-    if not questions:
+    quiz = get_quiz_view(pk)
+    if not quiz.questions:
         raise Http404("no questions in the quiz.")
     context["title"] = quiz.title
-    if questions is not None:
-        for question in questions:
-            data.append(
-                {
-                    "id": question.pk,
-                    "figure": question.figure,
-                    "content": question.content,
-                    "answers": question.get_answers_list(),
-                }
-            )
-    context["questions"] = data
+    context["questions"] = [
+        (question, shuffled(question.answers)) for question in quiz.questions
+    ]
+    context["attempt"] = uuid.uuid4().hex
+    context["version"] = None
+    if quiz.version is not None:
+        context["version"] = sign_version(context["attempt"], quiz.version)
     context["pk"] = pk
     context["url"] = quiz_url
     response = render(request, template_name, context)
     return response
 
 
+@rate_limit
 def solutions(request, pk, quiz_url):
     """Display results for a submitted quiz.
 
+    Grading uses the answer key stored in the snapshot version the student
+    was shown (the signed ``version`` token), or the published one.
+    For published quizzes the rendered result is cached under a hash of the
+    normalized guesses and the ``attempt`` token, so repeated submissions
+    are not regraded or stored twice. Unpublished quizzes are regraded on
+    every request, but a repeated submission is still stored only once.
+    Requests are rate limited per client (see :mod:`MCQuizApp.ratelimit`).
+
     **HTTP method:** ``GET`` with answer parameters in query string.
 
     **Context:**
-        ``questions`` -- list containing question data and guesses
+        ``questions`` -- list of ``(question, guess, choices)`` tuples
         ``total`` -- number of correct answers
         ``score`` -- percentage score
         ``errors`` -- number of incorrect answers
         ``number`` -- total number of questions
+        ``percentile`` -- percentile rank of the score among all attempts
+        ``top_scores`` -- the five highest scores for the quiz
 
     **Template:** ``MCQuizApp/solutions.html``
     """
 
-    guesses = request.GET.dict()
-    questions = Quiz.objects.get(id=pk).get_questions()
+    template_name = "MCQuizApp/solutions.html"
+    quiz = get_quiz_view(pk, signed_version(request.GET))
+    if not quiz.questions:
+        raise Http404("no questions in the quiz.")
+    guesses = normalize_guesses(quiz, request.GET)
+    attempt = request.GET.get("attempt", "")[:64]
 
-    question = []
-    for item in questions:
-        if str(item.id) in guesses.keys():
+    def grade(record=True):
+        question = []
+        total_correct = 0
+        for item in quiz.questions:
             guess = guesses[str(item.id)]
-        else:
-            guess = None
-        question.append(
-            {
-                "figure": item.figure,
-                "content": str(item.content),
-                "guess": guess,
-                "answer": str(item.get_answer_id()),
-                "choices": item.get_answers_list(),
-            }
-        )
+            if guess == item.answer:
+                total_correct += 1
+            question.append((item, guess, shuffled(item.answers)))
+
+        if record:
+            record_submission(quiz, guesses, attempt, total_correct)
+        total_questions = len(quiz.questions)
+        percentage = total_correct / total_questions * 100
+        distribution = Distribution(quiz.id)
+        context = {}
+        context["questions"] = question
+        context["total"] = total_correct
+        context["score"] = percentage
+        context["errors"] = total_questions - total_correct
+        context["number"] = total_questions
+        context["percentile"] = distribution.percentile(total_correct, total_questions)
+        context["top_scores"] = distribution.top()
+        return render_to_string(template_name, context, request)
+
+    key = submission_key(quiz, guesses, attempt)
+    if quiz.version is None:
+        return HttpResponse(grade(record=get_cache().add(key, True, get_timeout())))
+    return HttpResponse(get_or_build(key, grade))
+
+
+def adaptive_view(request, pk, quiz_url):
+    """Deliver a quiz adaptively, one question at a time.
+
+    Each next question is the unused one whose calibrated difficulty is
+    closest to the student's running ability estimate (see
+    :mod:`MCQuizApp.adaptive`). Progress is kept in the session and the
+    finished attempt is stored as an adaptive submission, which is left out
+    of the fixed-form statistics and score histogram.
+
+    **HTTP method:** ``GET`` to show the current question or the result,
+    ``POST`` with ``answer`` to answer it. ``?restart=1`` starts over.
+
+    **Context:**
+        ``title`` -- quiz title
+        ``question`` -- current question, or ``None`` when finished
+        ``answers`` -- its answers in random order
+        ``number`` -- position of the current question
+        ``length`` -- number of questions in the attempt
+        ``correct`` -- number of correct answers so far
+        ``ability`` -- current ability estimate
+
+    **Template:** ``MCQuizApp/adaptive.html``
+    """
+
+    quiz = get_quiz_view(pk)
+    if not quiz.questions:
+        raise Http404("no questions in the quiz.")
+    index = get_item_index(quiz)
+    length = min(get_adaptive_length(), len(quiz.questions))
+    session_key = "mcquiz_adaptive_{}".format(pk)
+    state = request.session.get(session_key)
+    # Unpublished quizzes have no version, so also restart when a question
+    # the attempt refers to is no longer in the quiz.
+    if (state is None or state["version"] != quiz.version or "restart" in request.GET
+            or any(item not in index.questions for item in state["items"])
+            or state["current"] is not None and state["current"] not in index.questions):
+        state = {
+            "version": quiz.version,
+            "attempt": uuid.uuid4().hex,
+            "items": [],
+            "guesses": [],
+            "results": [],
+            "ability": 0.0,
+            "current": None,
+        }
 
-    total_correct = 0
-    total_incorrect = 0
-    for item in question:
-        if item["guess"] == item["answer"]:
-            total_correct += 1
-        else:
-            total_incorrect += 1
+    finished = len(state["items"]) >= length
+    if request.method == "POST" and not finished and state["current"] is not None:
+        question = index.questions[state["current"]]
+        guess = request.POST.get("answer")
+        state["items"].append(question.id)
+        state["guesses"].append(guess)
+        state["results"].append(guess == question.answer)
+        state["ability"] = estimate_ability(
+            (index.difficulty(item), result)
+            for item, result in zip(state["items"], state["results"]))
+        state["current"] = None
+        if len(state["items"]) >= length:
+            guesses = {
+                str(item): guess for item, guess in zip(state["items"], state["guesses"])}
+            record_submission(
+                quiz, guesses, state["attempt"], sum(state["results"]),
+                mode=Submission.ADAPTIVE)
+        request.session[session_key] = state
+        return redirect(request.path)
+
+    question = None
+    if not finished:
+        if state["current"] is None:
+            state["current"] = index.next_item(state["ability"], set(state["items"]))
+        question = index.questions[state["current"]]
+    request.session[session_key] = state
 
-    total_questions = len(questions)
-    percentage = total_correct / total_questions * 100
     context = {}
-    context["questions"] = question
-    context["total"] = total_correct
-    context["score"] = percentage
-    context["errors"] = total_incorrect
-    context["number"] = total_questions
-    return render(request, "MCQuizApp/solutions.html", context)
+    context["title"] = quiz.title
+    context["question"] = question
+    context["answers"] = shuffled(question.answers) if question else []
+    context["number"] = len(state["items"]) + 1
+    context["length"] = length
+    context["correct"] = sum(state["results"])
+    context["ability"] = state["ability"]
+    return render(request, "MCQuizApp/adaptive.html", context)
+
+
+def shuffled(answers):
+    """Return a new list with ``answers`` in random order."""
+    return random.sample(answers, len(answers))